@@ -1,3 +1,5 @@
 from .model import Model
+from .batch_model import BatchModel
+from .result_store import ResultStore
 from .constant import *
 from .command import *
\ No newline at end of file
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+"""
+This file builds non-uniform x grids for the conductance of a single experiment.
+Points are concentrated on the conductance risers: the grid is seeded with the
+closed-form riser positions of Model.step_edges, then every interval whose
+linear interpolation misses the conductance at one of its thirds by more than
+half the tolerance is split in three, until the whole curve is resolved.
+Checking two interior points catches intervals centred on an inflection point,
+where the chord is exact at the midpoint.
+"""
+
+def adaptive_grid(model, channels, x_range, tol=1e-3, max_points=100000):
+    """
+    This will sample the total transmission rate of a model on an adaptive grid.
+
+    Parameters
+    ----------
+    model: object (Model)
+        The experiment.
+    channels: int
+        The number of channels.
+    x_range: tuple (float, float)
+        The lower and upper bound of x.
+    tol: float (Optional)
+        The largest allowed error of linear interpolation between the grid points,
+        in units of 2e^2/h. Default is 1e-3.
+    max_points: int (Optional)
+        The largest number of grid points. Default is 100000.
+
+    Returns
+    -------
+    x: array
+        The non-uniform, increasing grid.
+    y: array
+        The total transmission rate on x.
+    """
+
+    lower, upper = x_range
+    edges = model.step_edges(channels)
+    widths = edges['widths'][:, None]
+    seeds = edges['midpoints'][..., None] + widths[..., None] * np.array([-1, -1/2, 0, 1/2, 1])
+    x = np.unique(np.concatenate([[lower, upper], np.linspace(lower, upper, 9), seeds.ravel()]))
+    x = x[(x >= lower) & (x <= upper)]
+    y = model.total_transmission(channels, x)
+
+    while len(x) < max_points:
+        step = np.diff(x)
+        thirds = np.concatenate([x[:-1] + step / 3, x[:-1] + 2 * step / 3])
+        y_thirds = model.total_transmission(channels, thirds)
+        chord = np.concatenate([(2 * y[:-1] + y[1:]) / 3, (y[:-1] + 2 * y[1:]) / 3])
+        error = np.abs(y_thirds - chord).reshape(2, -1).max(axis=0)
+        refine = np.flatnonzero(error > tol / 2)[:(max_points - len(x)) // 2]
+        if len(refine) == 0:
+            break
+        refine = np.concatenate([refine, refine + len(step)])
+        x = np.concatenate([x, thirds[refine]])
+        y = np.concatenate([y, y_thirds[refine]])
+        order = np.argsort(x, kind='stable')
+        x, y = x[order], y[order]
+    return x, y
+
+def resample(x, y, x_new):
+    """
+    This will interpolate an adaptively sampled curve onto another grid.
+
+    Parameters
+    ----------
+    x, y: array
+        The adaptive grid and its values, as returned by adaptive_grid.
+    x_new: array
+        The new grid.
+
+    Returns
+    -------
+    y_new: array
+        The curve linearly interpolated on x_new.
+    """
+    return np.interp(x_new, x, y)
@@ -0,0 +1,269 @@
+import numpy as np
+from numpy import radians, degrees
+from .model import cyclotron_energy, saddle_energies, zeeman_energy, transmission_kernel, \
+    total_transmission_gradients, step_edges, level_crossings
+
+
+# Bytes held per evaluated point while streaming: the output block, the two
+# kernel buffers and the scaled copy that is yielded.
+BYTES_PER_POINT = 4 * np.dtype(float).itemsize
+
+
+def chunk_shape(n_rows, n_cols, max_bytes):
+    """
+    This will choose the block shape for streaming an (n_rows, n_cols) conductance
+    map under a memory budget. Whole rows of x are preferred, then rows are
+    stacked until the budget is used.
+
+    Parameters
+    ----------
+    n_rows: int
+        The number of experiments.
+    n_cols: int
+        The number of x values.
+    max_bytes: int
+        The memory budget of one block in bytes.
+
+    Returns
+    -------
+    rows, cols: (int, int)
+        The number of experiments and x values in each block, at least 1.
+    """
+    points = max(1, int(max_bytes) // BYTES_PER_POINT)
+    cols = max(1, min(n_cols, points))
+    rows = max(1, min(n_rows, points // cols))
+    return rows, cols
+
+
+"""
+This class stores a whole table of experimental setups and performs the
+transmission calculations of all the experiments at once. Every parameter is
+kept as a column array, so the conductance of N experiments is computed with
+numpy broadcasting instead of one Model object per experiment.
+"""
+
+class BatchModel:
+    def __init__(self, material, hw_x, hw_y, V_sd=0, magnetic_field=0, angle=0):
+
+        # Basic ingredients:
+        hw_x, hw_y, V_sd, magnetic_field, angle = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(param, dtype=float))
+              for param in (hw_x, hw_y, V_sd, magnetic_field, angle)])
+        self.m = material
+        self.hw_x = hw_x
+        self.hw_y = hw_y
+        self.eVsd = V_sd  # V_sd in mV ==> eV_sd in meV
+        self.magnetic_field = magnetic_field
+        self.angle = radians(angle)
+        self.hw_c = cyclotron_energy(self.m, self.magnetic_field, self.angle)
+        self.angular_freq = self.hw_c ** 2 + self.hw_y ** 2 - self.hw_x ** 2
+
+        # Advanced ingredients:
+        self.E1, self.E2 = saddle_energies(self.hw_x, self.hw_y, self.hw_c)
+
+    @classmethod
+    def from_setup(cls, material, exp_setup):
+        """
+        This will construct the batch from an experiment setup table.
+
+        Parameters
+        ----------
+        material: object (Material)
+            This object stores the data such as Lande g factor, effective electron
+            mass for specific material.
+        exp_setup: 2d-array
+            The experiment setup, see the csv file format for details. Each row
+            is (hbar w_x, w_y/w_x, V_sd, B, angle).
+
+        Returns
+        -------
+        batch: BatchModel
+            The batch containing one experiment per row of exp_setup.
+        """
+        exp_setup = np.atleast_2d(np.asarray(exp_setup, dtype=float))
+        hw_x = exp_setup[:, 0]
+        hw_y = exp_setup[:, 1] * hw_x
+        return cls(material, hw_x, hw_y, exp_setup[:, 2], exp_setup[:, 3], exp_setup[:, 4])
+
+    def __len__(self):
+        return len(self.hw_x)
+
+    def subset(self, rows):
+        """
+        This will construct the batch of a subset of the experiments.
+
+        Parameters
+        ----------
+        rows: slice or array
+            The experiments to keep.
+
+        Returns
+        -------
+        batch: BatchModel
+            The batch containing only the selected experiments.
+        """
+        return BatchModel(self.m, self.hw_x[rows], self.hw_y[rows], self.eVsd[rows],
+                          self.magnetic_field[rows], degrees(self.angle[rows]))
+
+    def zeeman(self, S):
+        """
+        This will calculate the zeeman energy in corresponding spins for every
+        experiment.
+
+        Parameters
+        ----------
+        S: float
+            The spin of electrons.
+
+        Returns
+        -------
+        zeeman_term: array
+            Returns the calculated Zeeman term of each experiment.
+        """
+        return zeeman_energy(self.m, S, self.magnetic_field)
+
+    def total_transmission(self, channels, x):
+        """
+        This will calculate the total transmission rate for all channels of every
+        experiment in the batch.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+        x: array
+            The x values on the graph, in this case roughly proportional to Fermi
+            energy. Either a 1d grid shared by all experiments, or a 2d array
+            with one row per experiment.
+
+        Returns
+        -------
+        output: 2d-array
+            Returns the total transmission rate of all channels, with shape
+            (number of experiments, number of x values).
+        """
+
+        x = np.asarray(x, dtype=float)
+        hw_x, eVsd, E1, E2 = (param[:, None] for param in (self.hw_x, self.eVsd, self.E1, self.E2))
+        zeeman_up = self.zeeman(1/2)[:, None]
+
+        output = np.zeros(np.broadcast_shapes((len(self), 1), x.shape))
+        for n in range(0, channels):
+            transmission_kernel(n, x, hw_x, eVsd, E1, E2, zeeman_up, out=output)
+        return output * 1/2
+
+    def transmission_gradients(self, channels, x, wrt=('x',)):
+        """
+        This will calculate the total transmission rate of every experiment together
+        with its analytic derivatives, at no extra evaluation of the transmission.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+        x: array
+            The x values on the graph. Either a 1d grid shared by all experiments,
+            or a 2d array with one row per experiment.
+        wrt: tuple of str (Optional)
+            The derivatives wanted: 'x' for dG/dx, 'E' for dG/dE_f with
+            E_f = hbar w_x * x, 'V_sd' for dG/dV_sd and 'B' for dG/dB.
+            Default is ('x',).
+
+        Returns
+        -------
+        output: dict
+            'G' is the total transmission rate and each key of wrt maps to its
+            derivative, all with shape (number of experiments, number of x values).
+        """
+        x = np.asarray(x, dtype=float)
+        return total_transmission_gradients(self, channels, x, wrt, column=True)
+
+    def step_edges(self, channels):
+        """
+        This will calculate the position of the conductance steps of every experiment
+        without a grid.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+
+        Returns
+        -------
+        edges: dict
+            'midpoints' has shape (number of experiments, channels, 4), the x values
+            of the riser midpoints of each channel and branch, in the order of
+            model.BRANCHES. 'widths' has shape (number of experiments, channels),
+            the 10%-90% widths of the risers in x. 'half_crossings' has the same
+            shape, the x values where the total transmission rate crosses n + 1/2.
+        """
+        edges = step_edges(self, channels, column=True)
+        edges['half_crossings'] = level_crossings(self, channels, np.arange(channels) + 1/2, column=True)
+        return edges
+
+    def level_crossings(self, channels, levels):
+        """
+        This will find the x values where the total transmission rate of every
+        experiment crosses levels.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+        levels: float or array
+            The conductance levels, between 0 and channels.
+
+        Returns
+        -------
+        crossings: 2d-array
+            The x values of the crossings, with shape (number of experiments,
+            number of levels).
+        """
+        return level_crossings(self, channels, np.atleast_1d(levels), column=True)
+
+    def iter_transmission(self, channels, x, max_bytes=64 * 2**20, chunk_rows=None, chunk_x=None):
+        """
+        This will calculate the total transmission rate block by block, so that the
+        whole (number of experiments, number of x values) array never has to be
+        held in memory.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+        x: array
+            The x values on the graph. Either a 1d grid shared by all experiments,
+            or a 2d array with one row per experiment.
+        max_bytes: int (Optional)
+            The memory budget of each block in bytes. Default is 64 MiB.
+        chunk_rows: int (Optional)
+            The number of experiments per block, overriding the budget.
+        chunk_x: int (Optional)
+            The number of x values per block, overriding the budget.
+
+        Yields
+        ------
+        rows: slice
+            The experiments covered by the block.
+        cols: slice
+            The x values covered by the block.
+        block: 2d-array
+            The total transmission rate of those experiments and x values.
+        """
+
+        x = np.asarray(x, dtype=float)
+        n_rows = len(self)
+        n_cols = x.shape[-1]
+        rows_per_block, cols_per_block = chunk_shape(n_rows, n_cols, max_bytes)
+        if chunk_rows is not None:
+            rows_per_block = int(chunk_rows)
+        if chunk_x is not None:
+            cols_per_block = int(chunk_x)
+
+        for row_start in range(0, n_rows, rows_per_block):
+            rows = slice(row_start, min(row_start + rows_per_block, n_rows))
+            batch = self.subset(rows)
+            x_rows = x[rows] if x.ndim == 2 else x
+            for col_start in range(0, n_cols, cols_per_block):
+                cols = slice(col_start, min(col_start + cols_per_block, n_cols))
+                yield rows, cols, batch.total_transmission(channels, x_rows[..., cols])
@@ -1,7 +1,7 @@
 import numpy as np
 from argparse import ArgumentParser
 from .model import Model
-from .command_helper import read_setup, plotter, read_material
+from .command_helper import read_setup, plotter, read_material, compute_results, save_results
 from .constant import Material
 
 
@@ -45,6 +45,22 @@ def process():
         action='store',
         help="The translation of the curves, in units of meV.")
 
+    parser.add_argument(
+        '--workers',
+        action='store',
+        help="The number of processes used to compute the experiments. Default is 1.")
+
+    parser.add_argument(
+        '--no-plot',
+        action='store_true',
+        help="Only compute the results, without the table and plots. Use with --output.")
+
+    parser.add_argument(
+        '--output',
+        action='store',
+        help="The name of a .npz file to save the conductance, the differential \
+            conductance and the derived energies of each experiment.")
+
     arguments = parser.parse_args()
 
     if arguments.material is None:
@@ -63,6 +79,11 @@ def process():
     else:
         offset = float(arguments.offset)
 
+    if arguments.workers is None:
+        workers = 1
+    else:
+        workers = int(arguments.workers)
+
     # Constants
     exp_setup = read_setup(arguments.experiment_setup)
     channels = int(arguments.channels)
@@ -86,8 +107,14 @@ def process():
 
     savefig = arguments.save
 
+    results = compute_results(material, exp_setup, channels, offset, workers=workers)
+    if arguments.output is not None:
+        save_results(arguments.output, results)
+        print("Results saved to:", arguments.output)
+
     # Plot graph
-    plotter(material, exp_setup, channels, offset, graph_name=graphname, savefig=savefig)
+    if not arguments.no_plot:
+        plotter(material, exp_setup, channels, offset, graph_name=graphname, savefig=savefig, workers=workers, results=results)
     
 if __name__ == "__main__":
     process()
@@ -1,12 +1,15 @@
 import numpy as np
 from .model import Model
-from matplotlib import pyplot as plt
+from .batch_model import BatchModel
+from .sweep import run_sweep
+from .setup_loader import load_setup
 from prettytable import PrettyTable
 
 
 def read_setup(file_name):
     """
-    This will take a .csv file and retrieve the experimental setup.
+    This will take a .csv file and retrieve the experimental setup. The setup is
+    validated and cached next to the file, see setup_loader.load_setup.
 
     Parameters
     ----------
@@ -19,14 +22,7 @@ def read_setup(file_name):
         This is the array for experiment setup.
     """
 
-    exp_setup = np.genfromtxt(
-        file_name,
-        delimiter=",",
-        skip_header=1)
-    if exp_setup.ndim == 1:
-        exp_setup = [exp_setup]
-        exp_setup = np.array(exp_setup)
-    return exp_setup
+    return load_setup(file_name)
 
 def read_material(file_name):
     """
@@ -50,7 +46,80 @@ def read_material(file_name):
         dtype=['<U10', float, float])
     return material
 
-def plotter(material, exp_setup, channels, offset, graph_name='conductance', fmt='pdf', savefig=None):
+def compute_results(material, exp_setup, channels, offset, workers=1):
+    """
+    This will calculate the conductance curves, the differential conductance and the
+    derived energy scales of every experiment, without any plotting.
+
+    Parameters
+    ----------
+    material: object (Material)
+        This object stores the data such as Lande g factor, effective electron
+        mass for specific material.
+    exp_setup: 2d-array
+        The experiment setup, see the csv file format for details.
+    channels: int
+        The number of electrons subband taken into account.
+    offset: float
+        The translation of the curves, in units of meV.
+    workers: int
+        The number of processes used to compute the curves. Default is 1.
+
+    Returns
+    -------
+    results: dict
+        The arrays 'x', 'conductance' (curve i translated by i * offset), 'x_diff',
+        'diff_conductance' (the analytic dG/dx on x_diff), 'plateau_end' (the
+        untranslated x where each curve reaches channels - 0.1) and the per experiment columns 'hw_x', 'w_ratio', 'V_sd',
+        'B', 'angle', 'E1', 'E2', 'hw_c' and 'zeeman'.
+    """
+
+    # Setting up conductance plot:
+    plots = len(exp_setup)
+    x = np.arange(-2, offset * plots + channels * 6, 0.1)
+
+    # Setting up differential plot:
+    x_diff = np.arange(-2, 30, 0.1)
+
+    # constructing models for all experiments at once:
+    batch = BatchModel.from_setup(material, exp_setup)
+
+    # calculate y values, each curve translated by its offset:
+    y = run_sweep(material, exp_setup, channels, x - offset * np.arange(plots)[:, None], workers=workers)
+    dydx = run_sweep(material, exp_setup, channels, x_diff, workers=workers, derivative='x')
+
+    return {
+        'x': x,
+        'conductance': y,
+        'x_diff': x_diff,
+        'diff_conductance': dydx,
+        'channels': channels,
+        'offset': offset,
+        'hw_x': batch.hw_x,
+        'w_ratio': batch.hw_y / batch.hw_x,
+        'V_sd': batch.eVsd,
+        'B': batch.magnetic_field,
+        'angle': batch.angle,
+        'E1': batch.E1,
+        'E2': batch.E2,
+        'hw_c': batch.hw_c,
+        'zeeman': batch.zeeman(1/2),
+        'plateau_end': batch.level_crossings(channels, channels - 0.1)[:, 0]}
+
+def save_results(file_name, results):
+    """
+    This will save the output of compute_results to a compressed .npz file.
+
+    Parameters
+    ----------
+    file_name: str
+        The name of the output file.
+    results: dict
+        The output of compute_results.
+    """
+    np.savez_compressed(file_name, **results)
+
+def plotter(material, exp_setup, channels, offset, graph_name='conductance', fmt='pdf', savefig=None, workers=1, results=None):
     """
     This will take in different experiment setup and plot the predicted graph.
 
@@ -70,12 +139,25 @@ def plotter(material, exp_setup, channels, offset, graph_name='conductance', fmt
     savefig: str
         The name of the fig if user wants it to be saved. If savefig is NONE, then 
         the figure will not be saved.
+    workers: int
+        The number of processes used to compute the curves. Default is 1.
+    results: dict
+        The output of compute_results, if it has already been calculated.
 
     Returns
     -------
     The required plot.
     """
 
+    from matplotlib import pyplot as plt
+
+    if results is None:
+        results = compute_results(material, exp_setup, channels, offset, workers=workers)
+    plots = len(exp_setup)
+    x = results['x']
+    y = results['conductance']
+    dydx = results['diff_conductance']
+
     # Initialise graph:
     fig, axs = plt.subplots(1, 1)
     fig.suptitle(graph_name)
@@ -88,40 +170,14 @@ def plotter(material, exp_setup, channels, offset, graph_name='conductance', fmt
     # Initialise table:
     table = PrettyTable()
     table.field_names = ['hbar w_x (meV)', 'w_y/ w_x', 'B (T)', 'angle (rad)', 'E1 (meV)', 'E2 (meV)', 'eVsd (meV)', 'hbar w_c (meV)', 'Zeeman (meV)']
-    
-    # Setting up conductance plot:
-    plots = len(exp_setup)
-    x = np.arange(-2, offset * plots + channels * 6, 0.1)
 
-    # Setting up differential plot:
-    x_diff = np.arange(-2, 30, 0.1)
-    dydx = []
-
-    for i in range(plots):
-        # initialise experiment setup:
-        experiment = exp_setup[i]
-        hw_x = experiment[0]
-        hw_y = experiment[1] * hw_x
-        V_sd = experiment[2]
-        B = experiment[3]
-        angle = experiment[4]
-
-        # constructing model:
-        model = Model(material, hw_x, hw_y, V_sd, B, angle)
-
-        # adding row data in table:
-        table.add_row([model.hw_x, model.hw_y/model.hw_x, model.magnetic_field, model.angle, model.E1, model.E2, model.eVsd, model.hw_c, model.zeeman(1/2)])
-        
-        # calculate y values:
-        y = model.total_transmission(channels, x - i * offset)
-        y_diff = model.total_transmission(channels, x_diff)
-        axs.plot(x,y)
-        if i == (plots-1):
-            min = np.where(y >= channels - 0.1)
-            x_min_index = min[0][0]
-            x_min = x[x_min_index] + 1
+    # adding row data in table:
+    columns = ['hw_x', 'w_ratio', 'B', 'angle', 'E1', 'E2', 'V_sd', 'hw_c', 'zeeman']
+    for row in zip(*[results[column] for column in columns]):
+        table.add_row(list(row))
 
-        dydx.append(np.gradient(y_diff))
+    axs.plot(x, y.T)
+    x_min = results['plateau_end'][-1] + (plots - 1) * offset + 1
 
     print(table)
     print('Note: The angle is in radian with respect to the normal of the 2DEG, i.e. a perpendicular field will have angle 0 rad while a parallel field will have angle pi/2 rad.')
@@ -139,7 +195,6 @@ def plotter(material, exp_setup, channels, offset, graph_name='conductance', fmt
         axs1.set_ylabel('Experiments')
         axs1.set_xlim([0, (x_min - (plots - 3)* offset) *10])
 
-        dydx = np.array(dydx)
         contour = axs1.contourf(dydx)
         fig1.colorbar(contour)
         if savefig is not None:
@@ -3,6 +3,373 @@ from numpy import pi, cos, exp, sqrt, radians
 from .constant import h_bar, mu_B, Material
 
 
+"""
+The following functions work element-wise, so they accept either scalars or
+numpy arrays of experiment parameters. They are shared by Model and BatchModel.
+"""
+
+def cyclotron_energy(material, magnetic_field, angle):
+    """
+    This will calculate the cyclotron energy from the perpendicular component
+    of the magnetic field.
+
+    Parameters
+    ----------
+    material: object (Material)
+        The material of the wire.
+    magnetic_field: float or array
+        The magnetic field in T.
+    angle: float or array
+        The angle of the field with respect to the normal of the 2DEG, in radian.
+
+    Returns
+    -------
+    hw_c: float or array
+        The cyclotron energy in meV. Values smaller than 1e-8 are set to 0.
+    """
+    hw_c = h_bar * magnetic_field * cos(angle) / material.m_e_eff * 10**(3) # In terms of meV
+    return np.where(np.abs(hw_c) < 0.00000001, 0, hw_c)
+
+def saddle_energies(hw_x, hw_y, hw_c):
+    """
+    This will calculate the energy scales E1 and E2 of the saddle point potential.
+
+    Parameters
+    ----------
+    hw_x: float or array
+        The confinement energy along the wire in meV.
+    hw_y: float or array
+        The confinement energy across the wire in meV.
+    hw_c: float or array
+        The cyclotron energy in meV.
+
+    Returns
+    -------
+    E1: float or array
+        The energy scale controlling the width of the conductance risers.
+    E2: float or array
+        The energy spacing between the subbands.
+    """
+    angular_freq = hw_c ** 2 + hw_y ** 2 - hw_x ** 2
+    root = ((angular_freq) ** 2 + 4 * (hw_x**2) * (hw_y**2))**(1/2)
+    E1 = 1/(2 * pi * sqrt(2)) * (root - angular_freq) ** (1/2)
+    E2 = 1/(sqrt(2)) * (root + angular_freq) ** (1/2)
+    return E1, E2
+
+def zeeman_energy(material, S, magnetic_field):
+    """
+    This will calculate the zeeman energy of electrons with spin S.
+
+    Parameters
+    ----------
+    material: object (Material)
+        The material of the wire.
+    S: float
+        The spin of electrons.
+    magnetic_field: float or array
+        The magnetic field in T.
+
+    Returns
+    -------
+    zeeman_term: float or array
+        Returns the calculated Zeeman term in meV.
+    """
+    return material.g * mu_B * S * magnetic_field
+
+
+def logistic(z):
+    """
+    This will calculate the logistic function 1/(1 + exp(-z)) in the tanh form,
+    which does not overflow for large |z|.
+
+    Parameters
+    ----------
+    z: float or array
+        The argument of the logistic function.
+
+    Returns
+    -------
+    output: float or array
+        The value of the logistic function, between 0 and 1.
+    """
+    return 1/2 * (1 + np.tanh(z / 2))
+
+def transmission_kernel(n, x, hw_x, eVsd, E1, E2, zeeman_up, out=None):
+    """
+    This will calculate the forward plus backward transmission rate of the nth
+    channel, for both spins, in a single pass. Using 1/(1 + exp(-z)) = (1 + tanh(z/2))/2,
+    the four branches reduce to 1 + 1/4 * sum(tanh(z/2)), which is evaluated in
+    two reused buffers and never overflows.
+
+    Parameters
+    ----------
+    n: int
+        The nth channel.
+    x: float or array
+        The x value on the graph, in this case roughly proportional to Fermi energy.
+    hw_x, eVsd, E1, E2: float or array
+        The experiment parameters, broadcastable against x.
+    zeeman_up: float or array
+        The Zeeman term of spin up electrons. Spin down uses -zeeman_up.
+    out: array (Optional)
+        If given, the transmission rate is added to this buffer in place.
+
+    Returns
+    -------
+    out: array
+        The forward plus backward transmission rate of the nth channel.
+    """
+    shape = np.broadcast_shapes(np.shape(x), np.shape(hw_x), np.shape(eVsd),
+                                np.shape(E1), np.shape(E2), np.shape(zeeman_up))
+    if out is None:
+        out = np.zeros(shape)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = 1 / (2 * E1)
+        base = np.empty(shape)
+        np.multiply(hw_x, x, out=base)
+        base -= (n + 1/2) * E2
+        base *= scale
+        shifts = [(bias + zeeman) * scale
+                  for bias in (1/2 * eVsd, -1/2 * eVsd)
+                  for zeeman in (zeeman_up, -zeeman_up)]
+
+        out += 1
+        buffer = np.empty(shape)
+        for shift in shifts:
+            np.add(base, shift, out=buffer)
+            np.tanh(buffer, out=buffer)
+            buffer *= 1/4
+            out += buffer
+    return out
+
+
+def saddle_energy_derivatives(hw_x, hw_y, hw_c, dhw_c):
+    """
+    This will calculate the derivatives of E1 and E2 with respect to a parameter
+    that only enters through the cyclotron energy, e.g. the magnetic field.
+
+    Parameters
+    ----------
+    hw_x, hw_y, hw_c: float or array
+        The confinement and cyclotron energies in meV.
+    dhw_c: float or array
+        The derivative of hw_c with respect to the parameter.
+
+    Returns
+    -------
+    dE1, dE2: float or array
+        The derivatives of E1 and E2 with respect to the parameter.
+    """
+    E1, E2 = saddle_energies(hw_x, hw_y, hw_c)
+    angular_freq = hw_c ** 2 + hw_y ** 2 - hw_x ** 2
+    root = ((angular_freq) ** 2 + 4 * (hw_x**2) * (hw_y**2))**(1/2)
+    d_angular_freq = 2 * hw_c * dhw_c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d_root = angular_freq / root * d_angular_freq
+        dE1 = E1 * (d_root - d_angular_freq) / (2 * (root - angular_freq))
+        dE2 = E2 * (d_root + d_angular_freq) / (2 * (root + angular_freq))
+    return np.nan_to_num(dE1), np.nan_to_num(dE2)
+
+def transmission_gradient_kernel(n, x, hw_x, eVsd, E1, E2, zeeman_up, out,
+                                 dE1_dB=0, dE2_dB=0, dzeeman_dB=0):
+    """
+    This will add the forward plus backward transmission rate of the nth channel,
+    and its derivatives, to the buffers in out. The derivatives come from the same
+    tanh terms as the transmission: d/dz (1 + tanh(z/2))/4 = (1 - tanh(z/2)**2)/8.
+
+    Parameters
+    ----------
+    n: int
+        The nth channel.
+    x: float or array
+        The x value on the graph, in this case roughly proportional to Fermi energy.
+    hw_x, eVsd, E1, E2: float or array
+        The experiment parameters, broadcastable against x.
+    zeeman_up: float or array
+        The Zeeman term of spin up electrons. Spin down uses -zeeman_up.
+    out: dict
+        The buffers to accumulate into. 'G' is the transmission rate, and the
+        optional keys 'x', 'E', 'V_sd' and 'B' are its derivatives with respect
+        to x, the Fermi energy hbar w_x * x, V_sd and the magnetic field.
+    dE1_dB, dE2_dB, dzeeman_dB: float or array (Optional)
+        The derivatives of E1, E2 and zeeman_up with respect to the magnetic
+        field, only needed for 'B'.
+
+    Returns
+    -------
+    out: dict
+        The updated buffers.
+    """
+    shape = out['G'].shape
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = 1 / (2 * E1)
+        base = np.empty(shape)
+        np.multiply(hw_x, x, out=base)
+        base -= (n + 1/2) * E2
+        base *= scale
+
+        out['G'] += 1
+        half_z = np.empty(shape)
+        slope = np.empty(shape)
+        for bias_sign in (1, -1):
+            for spin_sign in (1, -1):
+                np.add(base, (bias_sign * 1/2 * eVsd + spin_sign * zeeman_up) * scale, out=half_z)
+                if 'B' in out:
+                    dz_dB = (spin_sign * dzeeman_dB - (n + 1/2) * dE2_dB) / E1 - 2 * half_z * dE1_dB / E1
+                np.tanh(half_z, out=slope)
+                out['G'] += slope / 4
+                np.multiply(slope, slope, out=slope)
+                np.subtract(1, slope, out=slope)
+                slope *= 1/8
+                if 'x' in out:
+                    out['x'] += slope * hw_x / E1
+                if 'E' in out:
+                    out['E'] += slope / E1
+                if 'V_sd' in out:
+                    out['V_sd'] += slope * bias_sign / (2 * E1)
+                if 'B' in out:
+                    out['B'] += slope * dz_dB
+    return out
+
+def total_transmission_gradients(model, channels, x, wrt=('x',), column=False):
+    """
+    This will calculate the total transmission rate and its derivatives for a
+    Model or a BatchModel in a single pass over the channels.
+
+    Parameters
+    ----------
+    model: Model or BatchModel
+        The experiments.
+    channels: int
+        The number of channels.
+    x: float or array
+        The x value on the graph, in this case roughly proportional to Fermi energy.
+    wrt: tuple of str (Optional)
+        The derivatives wanted, any of 'x', 'E', 'V_sd' and 'B'. Default is ('x',).
+    column: bool (Optional)
+        Whether the parameters of model are arrays over experiments, which are then
+        broadcast against x as columns.
+
+    Returns
+    -------
+    output: dict
+        'G' is the total transmission rate and each key of wrt maps to its derivative.
+    """
+    params = [model.hw_x, model.hw_y, model.eVsd, model.E1, model.E2, model.hw_c,
+              model.angle, model.magnetic_field]
+    if column:
+        params = [np.asarray(param)[:, None] for param in params]
+    hw_x, hw_y, eVsd, E1, E2, hw_c, angle, magnetic_field = params
+    zeeman_up = zeeman_energy(model.m, 1/2, magnetic_field)
+
+    extra = {}
+    if 'B' in wrt:
+        dhw_c = h_bar * cos(angle) / model.m.m_e_eff * 10**(3)
+        extra['dE1_dB'], extra['dE2_dB'] = saddle_energy_derivatives(hw_x, hw_y, hw_c, dhw_c)
+        extra['dzeeman_dB'] = zeeman_energy(model.m, 1/2, 1)
+
+    shape = np.broadcast_shapes(np.shape(x), np.shape(hw_x))
+    output = {key: np.zeros(shape) for key in ('G',) + tuple(wrt)}
+    for n in range(0, channels):
+        transmission_gradient_kernel(n, x, hw_x, eVsd, E1, E2, zeeman_up, output, **extra)
+    return {key: value * 1/2 for key, value in output.items()}
+
+
+# Order of the four transmission branches in step_edges: (direction, spin).
+BRANCHES = [('forward', 'up'), ('forward', 'down'), ('backward', 'up'), ('backward', 'down')]
+
+def step_edges(model, channels, column=False):
+    """
+    This will calculate the conductance risers of a Model or a BatchModel in closed
+    form. Every branch is a logistic step in x, centred where its argument vanishes
+    and rising from 10% to 90% over 2 ln(9) E1 / hbar w_x.
+
+    Parameters
+    ----------
+    model: Model or BatchModel
+        The experiments.
+    channels: int
+        The number of channels.
+    column: bool (Optional)
+        Whether the parameters of model are arrays over experiments.
+
+    Returns
+    -------
+    edges: dict
+        'midpoints' has shape (..., channels, 4), the x positions of the riser
+        midpoints of each channel and branch, in the order of BRANCHES.
+        'widths' has shape (..., channels), the 10%-90% width of the risers in x.
+    """
+    params = [model.hw_x, model.eVsd, model.E1, model.E2, model.zeeman(1/2)]
+    params = [np.asarray(param, dtype=float) for param in params]
+    if column:
+        params = [param[:, None, None] for param in params]
+    hw_x, eVsd, E1, E2, zeeman_up = params
+
+    n = np.arange(channels)[:, None]
+    signs = np.array(BRANCHES) == np.array(['forward', 'up'])
+    bias = np.where(signs[:, 0], 1/2, -1/2) * eVsd
+    zeeman = np.where(signs[:, 1], 1, -1) * zeeman_up
+    midpoints = ((n + 1/2) * E2 - bias - zeeman) / hw_x
+    widths = np.broadcast_to(2 * np.log(9) * E1 / hw_x, midpoints.shape[:-1] + (1,))[..., 0]
+    return {'midpoints': midpoints, 'widths': np.array(widths)}
+
+def level_crossings(model, channels, levels, column=False, tol=1e-10, max_iter=200):
+    """
+    This will find where the total transmission rate crosses given levels, by a
+    bisection run on all levels (and experiments) at once. The transmission rate is
+    increasing in x, so each crossing is unique.
+
+    Parameters
+    ----------
+    model: Model or BatchModel
+        The experiments.
+    channels: int
+        The number of channels.
+    levels: float or array
+        The conductance levels, between 0 and channels.
+    column: bool (Optional)
+        Whether the parameters of model are arrays over experiments.
+    tol: float (Optional)
+        The accuracy of the crossings in x. Default is 1e-10.
+    max_iter: int (Optional)
+        The maximum number of bisection steps. Default is 200.
+
+    Returns
+    -------
+    crossings: float or array
+        The x values of the crossings, with shape (..., number of levels). A
+        level that is not reached within the bracket of the steps gives NaN.
+
+    Raises
+    ------
+    ValueError
+        If a level is not strictly between 0 and channels.
+    """
+    levels = np.asarray(levels, dtype=float)
+    if np.any((levels <= 0) | (levels >= channels)):
+        raise ValueError("The levels must be strictly between 0 and %d." % channels)
+    edges = step_edges(model, channels, column)
+    margin = 50 * edges['widths'].max(axis=-1, keepdims=True)
+    lo = edges['midpoints'].min(axis=(-2, -1))[..., None] - margin
+    hi = edges['midpoints'].max(axis=(-2, -1))[..., None] + margin
+    shape = np.broadcast_shapes(lo.shape, levels.shape)
+    lo, hi = np.broadcast_to(lo, shape).copy(), np.broadcast_to(hi, shape).copy()
+    bracketed = (model.total_transmission(channels, lo) < levels) & \
+        (model.total_transmission(channels, hi) >= levels)
+
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        below = model.total_transmission(channels, mid) < levels
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+        if np.all(hi - lo < tol):
+            break
+    return np.where(bracketed, (lo + hi) / 2, np.nan)
+
+
 """
 This class stores all the required data of a certain experimental setup and perform
 required calculations of the transmission rate.
@@ -18,15 +385,11 @@ class Model:
         self.eVsd = V_sd  # V_sd in mV ==> eV_sd in meV
         self.magnetic_field = magnetic_field
         self.angle = radians(angle)
-        self.hw_c = h_bar * self.magnetic_field * cos(self.angle) / self.m.m_e_eff * 10**(3) # In terms of meV
-        if np.abs(self.hw_c) < 0.00000001:
-            self.hw_c = 0
+        self.hw_c = float(cyclotron_energy(self.m, self.magnetic_field, self.angle))
         self.angular_freq = self.hw_c ** 2 + self.hw_y ** 2 - self.hw_x ** 2
 
         # Advanced ingredients:
-        self.E1 = 1/(2 * pi * sqrt(2)) * (((self.angular_freq) ** 2 + 4 * (self.hw_x**2) * (self.hw_y**2))**(1/2) - self.angular_freq) ** (1/2)
-
-        self.E2 = 1/(sqrt(2)) * (((self.angular_freq) ** 2 + 4 * (self.hw_x**2) * (self.hw_y**2))**(1/2) + self.angular_freq) ** (1/2)
+        self.E1, self.E2 = saddle_energies(self.hw_x, self.hw_y, self.hw_c)
 
     # Zeeman splitting term:
     def zeeman(self, S):
@@ -43,7 +406,7 @@ class Model:
         zeeman_term: float
             Returns the calculated Zeeman term.
         """
-        zeeman_term = self.m.g * mu_B * S * self.magnetic_field
+        zeeman_term = zeeman_energy(self.m, S, self.magnetic_field)
         return zeeman_term
 
     # Transmission terms:
@@ -68,8 +431,8 @@ class Model:
         E1 = self.E1
         E2 = self.E2
 
-        t_forward = 1/2 * 1/(1 + np.exp(-1/E1 * (self.hw_x * x + 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_up)))) + \
-            1/2 * 1/(1 + np.exp(-1/E1 * (self.hw_x * x + 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_down))))
+        t_forward = 1/2 * logistic(1/E1 * (self.hw_x * x + 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_up))) + \
+            1/2 * logistic(1/E1 * (self.hw_x * x + 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_down)))
         return t_forward
 
     def backward_transmission(self, n, x):
@@ -94,8 +457,8 @@ class Model:
         E1 = self.E1
         E2 = self.E2
 
-        t_backward = 1/2 * 1/(1 + np.exp(-1/E1 * (self.hw_x * x - 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_up)))) + \
-            1/2 * 1/(1 + np.exp(-1/E1 * (self.hw_x * x - 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_down))))
+        t_backward = 1/2 * logistic(1/E1 * (self.hw_x * x - 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_up))) + \
+            1/2 * logistic(1/E1 * (self.hw_x * x - 1/2 * self.eVsd -(n + 1/2) * E2 + self.zeeman(spin_down)))
         return t_backward
 
     def total_transmission(self, channels, x):
@@ -116,7 +479,70 @@ class Model:
             Returns the total transmission rate of all channels.
         """
 
-        output = 0
+        output = np.zeros(np.shape(x))
         for i in range (0, channels):
-            output = output + self.forward_transmission(i, x) + self.backward_transmission(i, x)
-        return output * 1/2
\ No newline at end of file
+            transmission_kernel(i, x, self.hw_x, self.eVsd, self.E1, self.E2, self.zeeman(1/2), out=output)
+        return output * 1/2
+
+    def transmission_gradients(self, channels, x, wrt=('x',)):
+        """
+        This will calculate the total transmission rate together with its analytic
+        derivatives, at no extra evaluation of the transmission.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+        x: float
+            The x value on the graph, in this case roughly proportional to Fermi energy.
+        wrt: tuple of str (Optional)
+            The derivatives wanted: 'x' for dG/dx, 'E' for dG/dE_f with
+            E_f = hbar w_x * x, 'V_sd' for dG/dV_sd and 'B' for dG/dB.
+            Default is ('x',).
+
+        Returns
+        -------
+        output: dict
+            'G' is the total transmission rate and each key of wrt maps to its derivative.
+        """
+        return total_transmission_gradients(self, channels, x, wrt)
+
+    def step_edges(self, channels):
+        """
+        This will calculate the position of the conductance steps without a grid.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+
+        Returns
+        -------
+        edges: dict
+            'midpoints' has shape (channels, 4), the x values of the riser midpoints
+            of each channel and branch, in the order of BRANCHES. 'widths' has
+            shape (channels,), the 10%-90% widths of the risers in x.
+            'half_crossings' has shape (channels,), the x values where the total
+            transmission rate crosses n + 1/2.
+        """
+        edges = step_edges(self, channels)
+        edges['half_crossings'] = level_crossings(self, channels, np.arange(channels) + 1/2)
+        return edges
+
+    def level_crossings(self, channels, levels):
+        """
+        This will find the x values where the total transmission rate crosses levels.
+
+        Parameters
+        ----------
+        channels: int
+            The number of channels.
+        levels: float or array
+            The conductance levels, between 0 and channels.
+
+        Returns
+        -------
+        crossings: array
+            The x values of the crossings.
+        """
+        return level_crossings(self, channels, np.atleast_1d(levels))
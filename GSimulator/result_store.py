@@ -0,0 +1,109 @@
+import os
+import json
+import numpy as np
+
+
+"""
+This class stores the conductance map of a parameter sweep on disk. A store is a
+directory holding a small JSON header, the experiment setup and the x grid as
+.npy files, and the (number of experiments, number of x values) conductance map
+as a .npy file that is opened as a memory map. Rows can therefore be written by
+several processes and read back in any subset without loading the whole sweep.
+"""
+
+class ResultStore:
+    HEADER_FILE = 'header.json'
+    SETUP_FILE = 'exp_setup.npy'
+    X_FILE = 'x.npy'
+    DATA_FILE = 'conductance.npy'
+    COLUMNS = ['hbar_w_x (meV)', 'w_y/w_x', 'V_sd (mV)', 'B (T)', 'angle (deg)']
+    VERSION = 1
+
+    def __init__(self, path, mode='r'):
+        self.path = path
+        with open(os.path.join(path, self.HEADER_FILE)) as header_file:
+            self.header = json.load(header_file)
+        self.channels = self.header['channels']
+        self.exp_setup = np.load(os.path.join(path, self.SETUP_FILE), mmap_mode='r')
+        self.x = np.load(os.path.join(path, self.X_FILE))
+        self.conductance = np.load(os.path.join(path, self.DATA_FILE), mmap_mode=mode)
+
+    @classmethod
+    def create(cls, path, exp_setup, x, channels, dtype=float):
+        """
+        This will create an empty store for a sweep.
+
+        Parameters
+        ----------
+        path: str
+            The directory of the store. It is created if it does not exist.
+        exp_setup: 2d-array
+            The experiment setup, see the csv file format for details.
+        x: array
+            The 1d x grid shared by all experiments.
+        channels: int
+            The number of electrons subband taken into account.
+        dtype: data-type (Optional)
+            The data type of the conductance map. Default is float64.
+
+        Returns
+        -------
+        store: ResultStore
+            The store opened for writing.
+
+        Raises
+        ------
+        ValueError
+            If x is not 1d.
+        """
+        exp_setup = np.atleast_2d(np.asarray(exp_setup, dtype=float))
+        x = np.asarray(x, dtype=float)
+        if x.ndim != 1:
+            raise ValueError("A ResultStore needs a 1d x grid shared by all experiments.")
+        os.makedirs(path, exist_ok=True)
+
+        header = {
+            'version': cls.VERSION,
+            'channels': int(channels),
+            'columns': cls.COLUMNS,
+            'shape': [len(exp_setup), len(x)],
+            'dtype': np.dtype(dtype).str}
+        with open(os.path.join(path, cls.HEADER_FILE), 'w') as header_file:
+            json.dump(header, header_file, indent=2)
+        np.save(os.path.join(path, cls.SETUP_FILE), exp_setup)
+        np.save(os.path.join(path, cls.X_FILE), x)
+        data = np.lib.format.open_memmap(os.path.join(path, cls.DATA_FILE), mode='w+',
+                                         dtype=dtype, shape=(len(exp_setup), len(x)))
+        del data
+        return cls(path, mode='r+')
+
+    def __len__(self):
+        return self.conductance.shape[0]
+
+    def __getitem__(self, rows):
+        """
+        This will read the conductance of a subset of the experiments.
+        """
+        return np.asarray(self.conductance[rows])
+
+    def write_rows(self, rows, block, cols=slice(None)):
+        """
+        This will write a block of conductance values into the store.
+
+        Parameters
+        ----------
+        rows: slice or array
+            The experiments covered by the block.
+        block: 2d-array
+            The conductance values.
+        cols: slice (Optional)
+            The x values covered by the block. Default is the whole grid.
+        """
+        self.conductance[rows, cols] = block
+
+    def flush(self):
+        """
+        This will flush the written rows to disk.
+        """
+        if isinstance(self.conductance, np.memmap):
+            self.conductance.flush()
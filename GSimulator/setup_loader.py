@@ -0,0 +1,97 @@
+import os
+import numpy as np
+
+
+"""
+This file loads experiment setup .csv files. The file is parsed in bulk against
+a fixed column schema, validated, and cached in a binary sidecar file next to
+the .csv. The cache is keyed on the path, size and modification time of the
+.csv, so repeated runs on an unchanged file skip parsing entirely.
+"""
+
+# (column name, lower bound, upper bound, lower bound inclusive)
+SETUP_SCHEMA = [
+    ('hbar_w_x (meV)', 0, np.inf, False),
+    ('w_y/w_x', 0, np.inf, False),
+    ('V_sd (mV)', -np.inf, np.inf, True),
+    ('B (T)', -np.inf, np.inf, True),
+    ('angle (deg)', -360, 360, True),
+]
+
+CACHE_VERSION = 1
+
+
+def cache_path(file_name):
+    """
+    This will give the path of the binary sidecar cache of a setup file.
+    """
+    directory, base = os.path.split(os.path.abspath(file_name))
+    return os.path.join(directory, '.' + base + '.cache.npz')
+
+def _cache_key(file_name):
+    stat = os.stat(file_name)
+    return np.array([os.path.abspath(file_name), str(stat.st_size), str(stat.st_mtime_ns), str(CACHE_VERSION)])
+
+def validate_setup(exp_setup):
+    """
+    This will check an experiment setup against SETUP_SCHEMA.
+
+    Parameters
+    ----------
+    exp_setup: 2d-array
+        The experiment setup, see the csv file format for details.
+
+    Raises
+    ------
+    ValueError
+        If the number of columns is wrong, or a value is not finite or out of range.
+    """
+    if exp_setup.ndim != 2 or exp_setup.shape[1] != len(SETUP_SCHEMA):
+        raise ValueError("The experiment setup must have %d columns: %s"
+                         % (len(SETUP_SCHEMA), ', '.join(column[0] for column in SETUP_SCHEMA)))
+
+    for i, (name, lower, upper, inclusive) in enumerate(SETUP_SCHEMA):
+        column = exp_setup[:, i]
+        above = column >= lower if inclusive else column > lower
+        bad = ~(np.isfinite(column) & above & (column <= upper))
+        if bad.any():
+            row = np.flatnonzero(bad)[0]
+            raise ValueError("Invalid value %r for '%s' in experiment %d." % (column[row], name, row + 1))
+
+def load_setup(file_name, cache=True):
+    """
+    This will take a .csv file and retrieve the validated experimental setup.
+
+    Parameters
+    ----------
+    file_name: str
+        The filename that contains the experiment setup in .csv format, with one
+        header line.
+    cache: bool (Optional)
+        Whether to read and write the binary sidecar cache. Default is True.
+
+    Returns
+    -------
+    exp_setup: 2d-array
+        This is the array for experiment setup, one row per experiment.
+    """
+
+    key = _cache_key(file_name)
+    sidecar = cache_path(file_name)
+    if cache and os.path.exists(sidecar):
+        try:
+            with np.load(sidecar) as cached:
+                if np.array_equal(cached['key'], key):
+                    return cached['exp_setup']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    exp_setup = np.loadtxt(file_name, delimiter=',', skiprows=1, ndmin=2, dtype=float)
+    validate_setup(exp_setup)
+
+    if cache:
+        try:
+            np.savez(sidecar, key=key, exp_setup=exp_setup)
+        except OSError:
+            pass
+    return exp_setup
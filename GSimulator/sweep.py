@@ -0,0 +1,135 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .batch_model import BatchModel
+from .result_store import ResultStore
+
+
+"""
+This file runs the conductance calculation of large experiment tables on a
+process pool. The rows of the table are split into shards, each shard is
+evaluated by a BatchModel in a worker process, and the results are put back in
+the original row order.
+"""
+
+def _sweep_shard(material, exp_setup, channels, x, derivative=None):
+    """
+    This is the worker of run_sweep, it evaluates one shard of the experiment table.
+    """
+    batch = BatchModel.from_setup(material, exp_setup)
+    if derivative is not None:
+        return batch.transmission_gradients(channels, x, wrt=(derivative,))[derivative]
+    return batch.total_transmission(channels, x)
+
+def _store_shard(material, exp_setup, channels, path, rows, max_bytes):
+    """
+    This is the worker of run_sweep when a store is given, it writes one shard of
+    the experiment table straight into the memory mapped store.
+    """
+    store = ResultStore(path, mode='r+')
+    batch = BatchModel.from_setup(material, exp_setup[rows])
+    for block_rows, cols, block in batch.iter_transmission(channels, store.x, max_bytes=max_bytes):
+        store.write_rows(slice(rows.start + block_rows.start, rows.start + block_rows.stop), block, cols)
+    store.flush()
+
+def shard_rows(n_rows, n_shards):
+    """
+    This will split the row indices of an experiment table into contiguous shards.
+
+    Parameters
+    ----------
+    n_rows: int
+        The number of experiments.
+    n_shards: int
+        The number of shards wanted.
+
+    Returns
+    -------
+    shards: list of slice
+        The non-empty shards, in row order.
+    """
+    bounds = np.linspace(0, n_rows, max(1, min(n_shards, n_rows)) + 1).astype(int)
+    return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+def run_sweep(material, exp_setup, channels, x, workers=None, shards_per_worker=4, store=None,
+              max_bytes=64 * 2**20, derivative=None):
+    """
+    This will calculate the total transmission rate of every experiment in the
+    setup table, sharing the rows across a process pool.
+
+    Parameters
+    ----------
+    material: object (Material)
+        This object stores the data such as Lande g factor, effective electron
+        mass for specific material.
+    exp_setup: 2d-array
+        The experiment setup, see the csv file format for details.
+    channels: int
+        The number of electrons subband taken into account.
+    x: array
+        The x values on the graph. Either a 1d grid shared by all experiments,
+        or a 2d array with one row per experiment.
+    workers: int (Optional)
+        The number of worker processes. Default is the number of CPUs. With 1
+        worker the sweep runs in the current process.
+    shards_per_worker: int (Optional)
+        The number of shards given to each worker, to balance the load. Default is 4.
+    store: str (Optional)
+        The directory of a ResultStore. If given, the store is created with the 1d
+        grid x and the workers write their rows directly into it.
+    max_bytes: int (Optional)
+        The memory budget of each block written to the store. Default is 64 MiB.
+    derivative: str (Optional)
+        If given, the analytic derivative of the conductance with respect to 'x',
+        'E', 'V_sd' or 'B' is returned instead of the conductance. Not supported
+        with store.
+
+    Returns
+    -------
+    output: 2d-array or ResultStore
+        The total transmission rate with shape (number of experiments, number of
+        x values), in the row order of exp_setup. If store is given, the opened
+        ResultStore is returned instead.
+
+    Raises
+    ------
+    ValueError
+        If store is given with a derivative or with a 2d x.
+    """
+
+    exp_setup = np.atleast_2d(np.asarray(exp_setup, dtype=float))
+    x = np.asarray(x, dtype=float)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    n_rows = len(exp_setup)
+
+    if store is not None:
+        if derivative is not None:
+            raise ValueError("A derivative cannot be written to a ResultStore.")
+        if x.ndim != 1:
+            raise ValueError("A ResultStore needs a 1d x grid shared by all experiments.")
+        ResultStore.create(store, exp_setup, x, channels)
+        shards = shard_rows(n_rows, max(1, workers) * shards_per_worker)
+        if workers <= 1 or n_rows <= 1:
+            for rows in shards:
+                _store_shard(material, exp_setup, channels, store, rows, max_bytes)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_store_shard, material, exp_setup, channels, store, rows, max_bytes)
+                           for rows in shards]
+                for future in futures:
+                    future.result()
+        return ResultStore(store)
+
+    if workers <= 1 or n_rows <= 1:
+        return _sweep_shard(material, exp_setup, channels, x, derivative)
+
+    output = np.empty((n_rows, x.shape[-1]))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for rows in shard_rows(n_rows, workers * shards_per_worker):
+            x_rows = x[rows] if x.ndim == 2 else x
+            futures.append((rows, pool.submit(_sweep_shard, material, exp_setup[rows], channels, x_rows, derivative)))
+        for rows, future in futures:
+            output[rows] = future.result()
+    return output
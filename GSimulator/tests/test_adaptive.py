@@ -0,0 +1,21 @@
+from GSimulator.model import Model
+from GSimulator.adaptive import adaptive_grid, resample
+from GSimulator.constant import Material
+import numpy as np
+
+def test_adaptive_grid_meets_tolerance():
+    model = Model(Material('GaAs', 2, 0.067), 1, 2, 0.5, 1.5, 45)
+    x, y = adaptive_grid(model, 5, (-2, 20), tol=1e-3)
+    x_dense = np.linspace(-2, 20, 100001)
+
+    assert np.all(np.diff(x) > 0)
+    assert x[0] == -2 and x[-1] == 20
+    assert len(x) < 1000
+    assert np.abs(resample(x, y, x_dense) - model.total_transmission(5, x_dense)).max() <= 1e-3
+
+def test_adaptive_grid_max_points():
+    model = Model(Material('GaAs', 2, 0.067), 1, 2, 0.5, 1.5, 45)
+    x, y = adaptive_grid(model, 5, (-2, 20), tol=1e-9, max_points=200)
+
+    assert len(x) <= 200
+    assert np.all(np.diff(x) > 0)
@@ -0,0 +1,67 @@
+from GSimulator.model import Model
+from GSimulator.batch_model import BatchModel
+from GSimulator.constant import Material
+import pytest
+import numpy as np
+
+exp_setup = np.array([[1, 2, 0, 0, 90],
+                      [1, 2, 0.5, 1, 45],
+                      [2, 1.5, 1, 3, 0]])
+
+def test_batch_matches_model():
+    material = Material('GaAs', 2, 0.067)
+    x = np.arange(-2, 10, 0.1)
+    batch = BatchModel.from_setup(material, exp_setup)
+    output = batch.total_transmission(3, x)
+
+    assert output.shape == (3, len(x))
+    for i, experiment in enumerate(exp_setup):
+        model = Model(material, experiment[0], experiment[1] * experiment[0], *experiment[2:])
+
+        assert batch.E1[i] == pytest.approx(model.E1)
+        assert batch.E2[i] == pytest.approx(model.E2)
+        assert batch.hw_c[i] == pytest.approx(model.hw_c)
+        assert output[i] == pytest.approx(model.total_transmission(3, x))
+
+def test_batch_per_row_grid():
+    material = Material('GaAs', 2, 0.067)
+    x = np.arange(-2, 10, 0.1)
+    batch = BatchModel.from_setup(material, exp_setup)
+    shifted = x - 2 * np.arange(len(exp_setup))[:, None]
+
+    output = batch.total_transmission(3, shifted)
+    for i in range(len(exp_setup)):
+        assert output[i] == pytest.approx(batch.total_transmission(3, shifted[i])[i])
+
+def test_iter_transmission_covers_grid():
+    material = Material('GaAs', 2, 0.067)
+    x = np.arange(-2, 10, 0.1)
+    batch = BatchModel.from_setup(material, exp_setup)
+    expected = batch.total_transmission(3, x)
+
+    output = np.full(expected.shape, np.nan)
+    for rows, cols, block in batch.iter_transmission(3, x, chunk_rows=2, chunk_x=7):
+        assert block.shape[0] <= 2 and block.shape[1] <= 7
+        output[rows, cols] = block
+
+    assert output == pytest.approx(expected)
+
+def test_iter_transmission_memory_budget():
+    material = Material('GaAs', 2, 0.067)
+    x = np.arange(-2, 10, 0.1)
+    batch = BatchModel.from_setup(material, exp_setup)
+
+    blocks = list(batch.iter_transmission(3, x, max_bytes=32 * 50))
+    assert all(block.size <= 50 for _, _, block in blocks)
+    assert sum(block.size for _, _, block in blocks) == len(exp_setup) * len(x)
+
+def test_batch_gradients_match_model():
+    material = Material('GaAs', 2, 0.067)
+    x = np.arange(-2, 10, 0.1)
+    gradients = BatchModel.from_setup(material, exp_setup).transmission_gradients(3, x, wrt=('x', 'B'))
+
+    for i, experiment in enumerate(exp_setup):
+        model = Model(material, experiment[0], experiment[1] * experiment[0], *experiment[2:])
+        expected = model.transmission_gradients(3, x, wrt=('x', 'B'))
+        assert gradients['x'][i] == pytest.approx(expected['x'])
+        assert gradients['B'][i] == pytest.approx(expected['B'])
@@ -0,0 +1,69 @@
+from GSimulator.model import Model, transmission_kernel
+from GSimulator.constant import Material
+import warnings
+import pytest
+import numpy as np
+
+def test_kernel_matches_branches():
+    model = Model(Material('GaAs', 2, 0.067), 1, 2, 0.5, 1, 45)
+    x = np.arange(-2, 10, 0.1)
+
+    for n in range(3):
+        expected = model.forward_transmission(n, x) + model.backward_transmission(n, x)
+        output = transmission_kernel(n, x, model.hw_x, model.eVsd, model.E1, model.E2, model.zeeman(1/2))
+        assert output == pytest.approx(expected)
+
+def test_kernel_accumulates_in_place():
+    model = Model(Material('GaAs', 2, 0.067), 1, 2, 0.5, 1, 45)
+    x = np.arange(-2, 10, 0.1)
+    out = np.ones(len(x))
+
+    result = transmission_kernel(0, x, model.hw_x, model.eVsd, model.E1, model.E2, model.zeeman(1/2), out=out)
+    assert result is out
+    assert out == pytest.approx(1 + model.forward_transmission(0, x) + model.backward_transmission(0, x))
+
+def test_total_transmission_no_overflow():
+    model = Model(Material('GaAs', 2, 0.067), 1, 0.001)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        output = model.total_transmission(3, np.array([-1000, 1000]))
+
+    assert output == pytest.approx([0, 3])
+
+def test_gradients_match_finite_difference():
+    material = Material('GaAs', 2, 0.067)
+    x = np.arange(-2, 6, 0.05)
+    step = 1e-6
+    gradients = Model(material, 1, 2, 0.5, 1.5, 45).transmission_gradients(3, x, wrt=('x', 'V_sd', 'B'))
+
+    def conductance(V_sd=0.5, B=1.5, shift=0):
+        return Model(material, 1, 2, V_sd, B, 45).total_transmission(3, x + shift)
+
+    assert gradients['G'] == pytest.approx(conductance())
+    assert gradients['x'] == pytest.approx((conductance(shift=step) - conductance(shift=-step)) / (2 * step), abs=1e-6)
+    assert gradients['V_sd'] == pytest.approx((conductance(V_sd=0.5 + step) - conductance(V_sd=0.5 - step)) / (2 * step), abs=1e-6)
+    assert gradients['B'] == pytest.approx((conductance(B=1.5 + step) - conductance(B=1.5 - step)) / (2 * step), abs=1e-6)
+
+def test_step_edges():
+    model = Model(Material('GaAs', 2, 0.067), 1, 2, 0.5, 1.5, 45)
+    edges = model.step_edges(3)
+
+    assert edges['midpoints'].shape == (3, 4)
+    assert edges['widths'] == pytest.approx(2 * np.log(9) * model.E1 / model.hw_x)
+    assert model.total_transmission(3, edges['half_crossings']) == pytest.approx([0.5, 1.5, 2.5])
+
+    # A single riser goes from 10% to 90% over its width:
+    n, width = 1, edges['widths'][1]
+    for midpoint, (direction, spin) in zip(edges['midpoints'][n], [(1, 1), (1, -1), (-1, 1), (-1, -1)]):
+        edge = lambda x: 1 / (1 + np.exp(-(model.hw_x * x + direction * model.eVsd / 2
+                                           - (n + 1/2) * model.E2 + spin * model.zeeman(1/2)) / model.E1))
+        assert edge(midpoint) == pytest.approx(0.5)
+        assert edge(midpoint + width / 2) == pytest.approx(0.9)
+
+def test_level_crossings_out_of_range():
+    model = Model(Material('GaAs', 2, 0.067), 1, 2, 0.5, 1.5, 45)
+
+    for level in (0, 3, -0.5, 3.5):
+        with pytest.raises(ValueError):
+            model.level_crossings(3, level)
+    assert model.total_transmission(3, model.level_crossings(3, [0.1, 2.9])) == pytest.approx([0.1, 2.9])
@@ -0,0 +1,35 @@
+from GSimulator.setup_loader import load_setup, cache_path
+import os
+import pytest
+import numpy as np
+
+header = "hbar_w_x (meV),w_x/w_y,V_sd (mV),B (T),angle (deg)\n"
+
+def test_load_and_cache(tmp_path):
+    file_name = tmp_path / 'setup.csv'
+    file_name.write_text(header + "1,2,0,0,90\n1,2,0.5,1,45\n")
+
+    exp_setup = load_setup(str(file_name))
+    assert exp_setup.shape == (2, 5)
+    assert exp_setup[1] == pytest.approx([1, 2, 0.5, 1, 45])
+    assert os.path.exists(cache_path(str(file_name)))
+    assert load_setup(str(file_name)) == pytest.approx(exp_setup)
+
+    file_name.write_text(header + "2,2,0,0,90\n")
+    assert load_setup(str(file_name)) == pytest.approx(np.array([[2, 2, 0, 0, 90]]))
+
+def test_single_row(tmp_path):
+    file_name = tmp_path / 'setup.csv'
+    file_name.write_text(header + "1,2,0,0,90\n")
+
+    assert load_setup(str(file_name), cache=False).shape == (1, 5)
+
+def test_invalid_setup(tmp_path):
+    file_name = tmp_path / 'setup.csv'
+    file_name.write_text(header + "1,2,0,0,90\n-1,2,0,0,90\n")
+    with pytest.raises(ValueError):
+        load_setup(str(file_name))
+
+    file_name.write_text(header + "1,2,0,0\n")
+    with pytest.raises(ValueError):
+        load_setup(str(file_name))
@@ -0,0 +1,45 @@
+from GSimulator.batch_model import BatchModel
+from GSimulator.sweep import run_sweep, shard_rows
+from GSimulator.constant import Material
+import pytest
+import numpy as np
+
+def test_shard_rows():
+    shards = shard_rows(10, 4)
+
+    assert shards[0].start == 0 and shards[-1].stop == 10
+    assert all(a.stop == b.start for a, b in zip(shards[:-1], shards[1:]))
+    assert len(shard_rows(2, 8)) == 2
+
+def test_parallel_sweep_keeps_row_order():
+    material = Material('GaAs', 2, 0.067)
+    exp_setup = np.column_stack([np.linspace(0.5, 2, 9), np.full(9, 2), np.linspace(0, 2, 9),
+                                 np.linspace(0, 3, 9), np.full(9, 45)])
+    x = np.arange(-2, 10, 0.1)
+    shifted = x - 2 * np.arange(9)[:, None]
+
+    expected = BatchModel.from_setup(material, exp_setup).total_transmission(3, shifted)
+    assert run_sweep(material, exp_setup, 3, shifted, workers=2) == pytest.approx(expected)
+
+def test_sweep_into_store(tmp_path):
+    material = Material('GaAs', 2, 0.067)
+    exp_setup = np.column_stack([np.linspace(0.5, 2, 9), np.full(9, 2), np.linspace(0, 2, 9),
+                                 np.linspace(0, 3, 9), np.full(9, 45)])
+    x = np.arange(-2, 10, 0.1)
+    expected = BatchModel.from_setup(material, exp_setup).total_transmission(3, x)
+
+    store = run_sweep(material, exp_setup, 3, x, workers=2, store=str(tmp_path / 'sweep'), max_bytes=32 * 100)
+    assert store.channels == 3
+    assert store.x == pytest.approx(x)
+    assert store[:] == pytest.approx(expected)
+    assert store[[1, 4]] == pytest.approx(expected[[1, 4]])
+
+def test_store_rejects_per_row_grid(tmp_path):
+    material = Material('GaAs', 2, 0.067)
+    exp_setup = np.column_stack([np.linspace(0.5, 2, 6), np.full(6, 2), np.zeros(6),
+                                 np.zeros(6), np.full(6, 45)])
+    x = np.arange(-2, 10, 0.1) - np.arange(6)[:, None]
+
+    with pytest.raises(ValueError):
+        run_sweep(material, exp_setup, 3, x, workers=1, store=str(tmp_path / 'sweep'))
+    assert not (tmp_path / 'sweep').exists()
@@ -1,5 +1,12 @@
 from .model import InteractingModel
 from .hamiltonians import *
+from .sparse_hamiltonians import *
+from .operators import *
+from .operator_cache import *
+from .result_cache import *
+from .adaptive import *
+from .multi_sweep import *
+from .symmetry import *
 from .model import *
 from .model_helper import *
 from .energy_lvl_graph import *
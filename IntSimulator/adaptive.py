@@ -0,0 +1,232 @@
+from .tracking import track_states
+from .eigensolvers import is_resolved
+from .model_helper import get_array
+from .results import sweep_result
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy.
+
+    Description:
+    This file samples an InteractingModel sweep on a non-uniform grid. The
+    experiments lie on the same line of (V, t) as the uniform sweep of
+    print_result, labelled by a fractional experiment index. A coarse grid
+    is diagonalised first, then every interval where the tracking is fragile
+    is split at its midpoint, until no interval is fragile or the budget of
+    diagonalisations is used. An interval is fragile when
+        - the tracked 1st excited state changes a lot, i.e. its overlap with
+          the state of the previous experiment is below 1 - tol, or
+        - the gap between the 1st excited state and its nearest candidate
+          changes by more than tol relative to the larger of the two gaps,
+    which both happen near avoided crossings. Inserting points changes the
+    state each later experiment is tracked from, so the tracking is
+    repeated over the whole grid. To repeat it without diagonalising again,
+    each experiment keeps all its energies but only the candidate
+    eigenstates holding most of the weight of the state it was tracked
+    from, see keep_candidates. When a new state is tracked to it and these
+    cannot certify the choice, see eigensolvers.is_resolved, the experiment
+    is diagonalised again.
+'''
+
+
+def keep_candidates(spectrum, state, tol):
+    """
+        This function keeps the fewest candidate eigenstates of an
+        experiment that hold all but tol**2 of the weight of the tracked
+        state on the candidates.
+
+    Parameters
+    ----------
+    spectrum: tuple
+        The output of InteractingModel.tracking_candidates.
+    state: numpy array or None
+        The state tracked to the experiment, None for the first experiment.
+    tol: float
+        The tolerance, see adaptive_sweep.
+
+    Returns
+    -------
+    kept: tuple
+        e_g, e_2 and the energies of all candidates, then the kept
+        candidate states as columns, the indices of their energies and the
+        state.
+    """
+
+    e_g, e_2, energies, vectors = spectrum
+    if state is None:
+        columns = np.arange(0)
+    else:
+        weights = np.abs(vectors.conj().T @ state) ** 2
+        order = np.argsort(weights)[::-1]
+        count = np.searchsorted(np.cumsum(weights[order]), weights.sum() - tol ** 2) + 1
+        columns = np.sort(order[:count])
+    return e_g, e_2, energies, vectors[:, columns], columns, state
+
+
+def track_grid(model, spectra, fractions, conf_strength, diagonalise=None):
+    """
+        This function tracks the 1st excited state through the diagonalised
+        experiments in order, as print_result does.
+
+    Parameters
+    ----------
+    model: InteractingModel
+        The model of the sweep.
+    spectra: dict
+        Maps each fractional index to its spectrum, see keep_candidates.
+    fractions: numpy array
+        The increasing fractional indices of the experiments.
+    conf_strength: numpy array
+        The confinement energy of each experiment.
+    diagonalise: function (Optional)
+        Called with a fractional index and a state when the kept candidates
+        of that experiment cannot certify the tracking of that state, it
+        gives the spectrum of the experiment again, which replaces the one
+        in spectra. Default is None, the kept candidates are trusted.
+
+    Returns
+    -------
+    levels: numpy array
+        levels[0], levels[1] and levels[2] are the ground state, 1st excited
+        state and highest energies of each experiment.
+    overlaps: numpy array
+        overlaps[i] is the overlap of the tracked states of experiments i
+        and i + 1.
+    gaps: numpy array
+        The energy gap between the 1st excited state and its nearest
+        candidate, nan for the first experiment.
+    states: list of numpy array
+        The tracked state of each experiment.
+    """
+
+    state = model.state_vector(model.get_1st_excited())
+    levels = np.zeros((3, len(fractions)))
+    overlaps = np.ones(len(fractions) - 1)
+    gaps = np.full(len(fractions), np.nan)
+    states = []
+
+    for i, fraction in enumerate(fractions):
+        e_g, e_2, energies, vectors, columns, source = spectra[fraction]
+        if i == 0:
+            e_1 = 3 / 2 * model.no_of_elec * conf_strength[0]
+        else:
+            if (diagonalise is not None and not np.array_equal(state, source)
+                    and not is_resolved(state, vectors)):
+                spectra[fraction] = diagonalise(fraction, state)
+                e_g, e_2, energies, vectors, columns, source = spectra[fraction]
+            index, e_1, new_state = track_states(state, energies[columns], vectors)
+            index, e_1 = columns[index], e_1[0]
+            overlaps[i - 1] = np.abs(np.vdot(state, new_state[:, 0]))
+            state = new_state[:, 0]
+            others = np.delete(energies, index[0])
+            if len(others):
+                gaps[i] = np.abs(others - e_1).min()
+        levels[:, i] = e_g, e_1, e_2
+        states.append(state)
+    return levels, overlaps, gaps, states
+
+
+def adaptive_sweep(model, pt_freq, budget, solver='full', k=6, tol=0.05,
+                   initial=None, min_step=1/64):
+    """
+        This function computes a sweep of a model on an adaptive grid, with
+        at most budget diagonalisations.
+
+    Parameters
+    ----------
+    model: InteractingModel
+        The model of the sweep.
+    pt_freq: int
+        The sweep covers the same experiments as print_result(pt_freq),
+        from the first to the last. At least 3.
+    budget: int
+        The largest number of diagonalisations, at least 3. Experiments
+        diagonalised again, see track_grid, count as well; only those of
+        the last tracking may exceed it.
+    solver: str (Optional)
+        'full', 'sparse' or 'symmetry', see print_result. Default is 'full'.
+    k: int (Optional)
+        The number of eigenpairs of the 'sparse' solver. Default is 6.
+    tol: float (Optional)
+        The tolerance of the overlap and gap criteria, and of the weight
+        of the candidates kept, see keep_candidates. Default is 0.05.
+    initial: int (Optional)
+        The number of experiments of the coarse grid, at least 3. Default
+        is a quarter of the budget.
+    min_step: float (Optional)
+        The smallest interval, in units of the uniform experiment step.
+        Default is 1/64.
+
+    Returns
+    -------
+    result: numpy recarray
+        One record per diagonalised experiment, in sweep order, see
+        InteractingModel.compute.
+
+    Raises
+    ------
+    ValueError
+        If pt_freq or budget is less than 3, as the coarse grid needs the
+        first two experiments and the last one.
+    """
+
+    if pt_freq < 3 or budget < 3:
+        raise ValueError("The adaptive sweep needs pt_freq and budget of at least 3.")
+
+    int_strength = get_array(model.inter_rng, pt_freq, model.int_incr)
+    conf_strength = get_array(model.wire_material.get_conf_rng(),
+                              pt_freq, model.conf_incr)
+    index = np.arange(pt_freq)
+
+    used = 0
+
+    def diagonalise(fraction, state):
+        nonlocal used
+        used += 1
+        t = np.interp(fraction, index, conf_strength)
+        v = np.interp(fraction, index, int_strength)
+        return keep_candidates(model.tracking_candidates(t, v, state, solver, k), state, tol)
+
+    # The coarse grid is diagonalised in order, each experiment with the
+    # state tracked to the previous one. It holds the first two experiments
+    # of the uniform sweep, as the first one is not tracked:
+    if initial is None:
+        initial = max(3, budget // 4)
+    initial = max(3, min(initial, budget, pt_freq))
+    coarse = np.concatenate([[0], np.linspace(1, pt_freq - 1, initial - 1)])
+    spectra = {}
+    state = model.state_vector(model.get_1st_excited())
+    for i, fraction in enumerate(coarse):
+        spectra[fraction] = diagonalise(fraction, state if i > 0 else None)
+        if i > 0:
+            _, _, _, vectors, columns, _ = spectra[fraction]
+            state = track_states(state, spectra[fraction][2][columns], vectors)[2][:, 0]
+
+    while True:
+        fractions = np.array(sorted(spectra))
+        t = np.interp(fractions, index, conf_strength)
+        levels, overlaps, gaps, states = track_grid(model, spectra, fractions, t, diagonalise)
+
+        # The first interval starts from the state without interaction,
+        # which is not an eigenstate of the first experiment, so it is not
+        # refined, as in the uniform sweep:
+        change = np.abs(np.diff(gaps)) / np.fmax(gaps[:-1], gaps[1:])
+        score = np.fmax(1 - overlaps, np.nan_to_num(change))
+        score[0] = 0
+        score[np.diff(fractions) < 2 * min_step] = 0
+
+        refine = np.argsort(score, kind='stable')[::-1][:max(budget - used, 0)]
+        refine = refine[score[refine] > tol]
+        if len(refine) == 0:
+            break
+
+        # The new experiments are diagonalised with the state tracked to
+        # the experiment before them:
+        for i in refine:
+            fraction = (fractions[i] + fractions[i + 1]) / 2
+            spectra[fraction] = diagonalise(fraction, states[i])
+
+    v = np.interp(fractions, index, int_strength)
+    return sweep_result(model.wire_material, v, t, levels)
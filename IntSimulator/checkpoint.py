@@ -0,0 +1,137 @@
+import numpy as np
+import json
+import os
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and the standard library json.
+
+    Description:
+    This file saves the progress of an InteractingModel sweep, so a sweep
+    stopped part way can be resumed. A checkpoint is a .npz file holding the
+    index of the next experiment, the energies found so far, the tracked 1st
+    excited state and, for the 'warm' solver, its starting vectors. It also
+    holds a key describing the sweep, and a checkpoint is only resumed by
+    the same sweep.
+'''
+
+CHECKPOINT_VERSION = 1
+
+
+def sweep_key(model, pt_freq, solver, k):
+    """
+        This function describes a sweep by everything its results depend on.
+
+    Parameters
+    ----------
+    model: InteractingModel
+        The model of the sweep.
+    pt_freq: int
+        This gives the number of experiments we want to conduct.
+    solver: str
+        The solver of the sweep.
+    k: int
+        The number of eigenpairs of the Lanczos solvers.
+
+    Returns
+    -------
+    key: str
+        A JSON description of the sweep.
+    """
+
+    material = model.wire_material
+    return json.dumps({
+        'version': CHECKPOINT_VERSION, 'no_of_elec': model.no_of_elec,
+        'inter_rng': [float(v) for v in model.inter_rng],
+        'conf_rng': [float(t) for t in material.get_conf_rng()],
+        'int_increase': model.int_incr, 'conf_increase': model.conf_incr,
+        'dtype': model.dtype.name, 'pt_freq': pt_freq, 'solver': solver, 'k': k})
+
+
+def save_checkpoint(file_name, key, index, levels, state, warm=None):
+    """
+        This function writes a checkpoint. It is written to a temporary file
+        first and then moved in place, so a crash while writing keeps the
+        previous checkpoint.
+
+    Parameters
+    ----------
+    file_name: str
+        The checkpoint file, ending in .npz.
+    key: str
+        The output of sweep_key.
+    index: int
+        The index of the next experiment.
+    levels: numpy array
+        The ground state, 1st excited state and highest energies, filled up
+        to index.
+    state: numpy array
+        The tracked 1st excited state.
+    warm: tuple (Optional)
+        The start and top_vector of the WarmStartSolver, if used.
+
+    Returns
+    -------
+    None
+    """
+
+    arrays = {'key': np.array(key), 'index': np.array(index), 'levels': levels, 'state': state}
+    if warm is not None and warm[0] is not None:
+        arrays['warm_start'], arrays['warm_top'] = warm
+
+    temporary = file_name + '.tmp.npz'
+    np.savez(temporary, **arrays)
+    os.replace(temporary, file_name)
+
+
+def load_checkpoint(file_name, key):
+    """
+        This function reads a checkpoint of a sweep.
+
+    Parameters
+    ----------
+    file_name: str
+        The checkpoint file.
+    key: str
+        The output of sweep_key for the sweep being resumed.
+
+    Returns
+    -------
+    checkpoint: dict or None
+        The arrays saved by save_checkpoint, or None if there is no
+        checkpoint file.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint belongs to a different sweep.
+    """
+
+    if not os.path.exists(file_name):
+        return None
+    with np.load(file_name) as saved:
+        checkpoint = {name: saved[name] for name in saved.files}
+    if str(checkpoint['key']) != key:
+        raise ValueError("The checkpoint '%s' belongs to a different sweep." % file_name)
+    checkpoint['index'] = int(checkpoint['index'])
+    return checkpoint
+
+
+def sweep_parameters(file_name):
+    """
+        This function reads the sweep parameters stored in a checkpoint.
+
+    Parameters
+    ----------
+    file_name: str
+        The checkpoint file.
+
+    Returns
+    -------
+    parameters: dict
+        The content of the sweep key, see sweep_key.
+    """
+
+    with np.load(file_name) as saved:
+        return json.loads(str(saved['key']))
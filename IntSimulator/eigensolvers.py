@@ -0,0 +1,472 @@
+from scipy import sparse
+from scipy.sparse.linalg import eigsh, splu, LinearOperator
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and scipy to diagonalise the Hamiltonians.
+
+    Description:
+    This file contains the eigensolvers used by InteractingModel. Every
+    solver returns the eigenenergies in increasing order, the eigenvectors
+    as the columns of a numpy array, and the largest eigenenergy.
+'''
+
+SOLVERS = ('full', 'sparse', 'symmetry', 'warm', 'matrix_free')
+
+
+def full_eigenpairs(H):
+    """
+        This function diagonalises the whole Hamiltonian.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix or numpy array
+        The Hamiltonian, real symmetric or Hermitian.
+
+    Returns
+    -------
+    energies: numpy array
+        All the eigenenergies in increasing order.
+    vectors: numpy array
+        The eigenvectors, vectors[:, i] belongs to energies[i].
+    top: float
+        The largest eigenenergy.
+    """
+
+    if sparse.issparse(H):
+        H = H.toarray()
+    energies, vectors = np.linalg.eigh(H)
+    return energies, vectors, energies[-1]
+
+
+def lowest_eigenpairs(H, k, v0=None):
+    """
+        This function finds only the k lowest eigenpairs and the largest
+        eigenenergy with the Lanczos method. Small matrices, where Lanczos
+        has no advantage, are diagonalised fully instead.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix or LinearOperator
+        The Hamiltonian, real symmetric or Hermitian.
+    k: int
+        The number of lowest eigenpairs.
+    v0: numpy array (Optional)
+        The starting vector of the Lanczos iteration.
+
+    Returns
+    -------
+    energies: numpy array
+        The k lowest eigenenergies in increasing order.
+    vectors: numpy array
+        The eigenvectors, vectors[:, i] belongs to energies[i].
+    top: float
+        The largest eigenenergy.
+    """
+
+    dim = H.shape[0]
+    if k >= dim - 1:
+        # A LinearOperator of a few states is written out to diagonalise it:
+        if isinstance(H, LinearOperator):
+            H = H @ np.eye(dim, dtype=H.dtype)
+        energies, vectors, top = full_eigenpairs(H)
+        return energies[:k], vectors[:, :k], top
+
+    energies, vectors = eigsh(H, k=k, which='SA', v0=v0)
+    order = np.argsort(energies)
+    top = eigsh(H, k=1, which='LA', return_eigenvectors=False)[0]
+    return energies[order], vectors[:, order], top
+
+
+def shift_invert_operator(H, sigma):
+    """
+        This function gives (H - sigma)^-1 as a LinearOperator, for the
+        shift-invert mode of eigsh. H - sigma is factorised once by sparse
+        LU.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix
+        The Hamiltonian, real symmetric or Hermitian.
+    sigma: float
+        The shift.
+
+    Returns
+    -------
+    OPinv: LinearOperator
+        The inverse of H - sigma.
+    """
+
+    shifted = (H - sigma * sparse.identity(H.shape[0], dtype=H.dtype)).tocsc()
+    return LinearOperator(H.shape, matvec=splu(shifted).solve, dtype=H.dtype)
+
+
+def is_resolved(target, vectors, candidates=slice(None)):
+    """
+        This function checks that no eigenstate missing from vectors can
+        overlap with the target more than the best candidate does. The
+        squared overlap of a missing eigenstate is at most the weight of the
+        target outside the span of vectors, so it is enough that the best
+        squared overlap of the candidates is at least that weight.
+
+    Parameters
+    ----------
+    target: numpy array
+        The tracked state.
+    vectors: numpy array
+        The eigenstates found, as columns.
+    candidates: slice or numpy array (Optional)
+        The columns of vectors the target may be tracked to. Default is all.
+
+    Returns
+    -------
+    resolved: bool
+        Whether the eigenstate of largest overlap is among the candidates.
+    """
+
+    basis = np.linalg.qr(vectors)[0]
+    missing = np.vdot(target, target).real - np.linalg.norm(basis.conj().T @ target) ** 2
+    best = np.max(np.abs(vectors[:, candidates].conj().T @ target) ** 2, initial=0)
+    return best >= missing
+
+
+def nearest_eigenpairs(H, k, target, basis=None, known=None, v0=None, count=None):
+    """
+        This function finds the k eigenpairs closest in energy to a target
+        state, with shift-invert Lanczos around the expectation value of H in
+        that state. The window is doubled, reusing the factorisation, until
+        the eigenstate of largest overlap with the target is certainly in it,
+        see is_resolved. Once it reaches 1/64 of the dimension, H is
+        diagonalised fully instead, which is then cheaper than Lanczos. If
+        the target is an eigenstate already, it is returned alone.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix
+        The Hamiltonian, real symmetric or Hermitian.
+    k: int
+        The initial number of eigenpairs.
+    target: numpy array
+        The normalised state of interest, a single 3^N vector.
+    basis: scipy sparse matrix (Optional)
+        An isometry whose columns span a subspace invariant under H and
+        holding the target, e.g. a symmetry sector, see symmetry.py. The
+        eigenpairs are then found in this subspace, which makes the
+        factorisation much cheaper. Default is the whole space.
+    known: tuple (Optional)
+        The energies and vectors of the lowest eigenpairs, found already.
+        They count towards the window, except the ground state, which is
+        never tracked to.
+    v0: numpy array (Optional)
+        The starting vector of the Lanczos iteration, e.g. the sum of the
+        previous window. Default is the target.
+    count: list (Optional)
+        count[0] is increased by the number of products with H and with
+        (H - sigma)^-1, and count[1] by the number of sparse LU
+        factorisations and dense diagonalisations.
+
+    Returns
+    -------
+    energies: numpy array
+        The eigenenergies of the window in increasing order.
+    vectors: numpy array
+        The eigenvectors, vectors[:, i] belongs to energies[i].
+    """
+
+    full_target = np.real_if_close(np.asarray(target).ravel())
+    target, lift = full_target, None
+    if basis is not None:
+        lift = basis.astype(H.dtype, copy=False)
+        H = lift.T @ H @ lift
+        target = lift.T @ target
+        v0 = None if v0 is None else lift.T @ v0
+    if v0 is not None and np.linalg.norm(v0) < 1e-8 * np.linalg.norm(target):
+        v0 = None
+    if count is None:
+        count = [0, 0]
+
+    product = H @ target
+    count[0] += 1
+    norm = np.linalg.norm(target)
+    sigma = np.real(np.vdot(target, product)) / norm ** 2
+    tol = np.sqrt(np.finfo(H.dtype).eps) * (1 + abs(sigma)) * norm
+    if np.linalg.norm(product - sigma * target) <= tol:
+        vector = target / norm
+        return np.array([sigma]), (vector if lift is None else lift @ vector)[:, None]
+
+    dim, OPinv = H.shape[0], None
+    while True:
+        if k >= dim // 64:
+            energies, vectors, _ = full_eigenpairs(H)
+            count[1] += 1
+        else:
+            if OPinv is None:
+                OPinv, solves = counting_operator(shift_invert_operator(H, sigma))
+                count[1] += 1
+            before = solves[0]
+            energies, vectors = eigsh(H, k=k, sigma=sigma, which='LM', OPinv=OPinv,
+                                      v0=target if v0 is None else v0)
+            count[0] += solves[0] - before
+            order = np.argsort(energies)
+            energies, vectors = energies[order], vectors[:, order]
+        if lift is not None:
+            vectors = lift @ vectors
+        if k >= dim // 64:
+            return energies, vectors
+
+        if known is None:
+            found, candidates = vectors, slice(None)
+        else:
+            found = merge_eigenpairs([known[0], energies], [known[1], vectors])[1]
+            candidates = slice(1, None)
+        if is_resolved(full_target, found, candidates):
+            return energies, vectors
+        k = 2 * k
+
+
+def tracking_eigenpairs(H, k, target, known, bases=None, starts=None, count=None):
+    """
+        This function adds the eigenpairs closest in energy to each tracked
+        state to the lowest eigenpairs, see nearest_eigenpairs.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix
+        The Hamiltonian, real symmetric or Hermitian.
+    k: int
+        The initial number of eigenpairs around each state.
+    target: numpy array
+        The tracked state, or several states as columns.
+    known: tuple
+        The energies and vectors of the lowest eigenpairs.
+    bases: list (Optional)
+        The symmetry sector of each tracked state, or None, see
+        nearest_eigenpairs. Default is the whole space for all of them.
+    starts: list (Optional)
+        The starting vector of the Lanczos iteration around each state.
+        Default is the states themselves.
+    count: list (Optional)
+        The work done, see nearest_eigenpairs.
+
+    Returns
+    -------
+    energies, vectors:
+        The joined eigenpairs, see merge_eigenpairs.
+    starts: list
+        The sum of the window vectors of each state, to start the next
+        experiment of a sweep from.
+    """
+
+    targets = np.asarray(target).reshape(H.shape[0], -1)
+    if bases is None:
+        bases = [None] * targets.shape[1]
+    if starts is None or len(starts) != targets.shape[1]:
+        starts = [None] * targets.shape[1]
+
+    energies, vectors, windows = [known[0]], [known[1]], []
+    for column, basis, start in zip(targets.T, bases, starts):
+        near_energies, near_vectors = nearest_eigenpairs(
+            H, k, column, basis, known=known, v0=start, count=count)
+        energies.append(near_energies)
+        vectors.append(near_vectors)
+        windows.append(near_vectors.sum(axis=1))
+    return merge_eigenpairs(energies, vectors) + (windows,)
+
+
+def merge_eigenpairs(energies, vectors, tol=1e-9):
+    """
+        This function joins eigenpairs found by several solver calls, sorting
+        them by energy and dropping states that were found twice.
+
+    Parameters
+    ----------
+    energies: list of numpy array
+        The eigenenergies of each call.
+    vectors: list of numpy array
+        The eigenvectors of each call, as columns.
+    tol: float (Optional)
+        Two states closer in energy than tol and with overlap above 0.99
+        are the same state.
+
+    Returns
+    -------
+    energies, vectors:
+        The joined eigenpairs.
+    """
+
+    energies = np.concatenate(energies)
+    vectors = np.concatenate(vectors, axis=1)
+    order = np.argsort(energies, kind='stable')
+    energies, vectors = energies[order], vectors[:, order]
+
+    keep = [0]
+    for j in range(1, len(energies)):
+        last = keep[-1]
+        same = abs(energies[j] - energies[last]) < tol and \
+            abs(np.vdot(vectors[:, last], vectors[:, j])) > 0.99
+        if not same:
+            keep.append(j)
+    return energies[keep], vectors[:, keep]
+
+
+def counting_operator(H):
+    """
+        This function wraps a matrix in a LinearOperator that counts how
+        often it is applied.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix or LinearOperator
+        The matrix.
+
+    Returns
+    -------
+    operator: LinearOperator
+        The wrapped matrix.
+    count: list
+        count[0] is the number of matrix-vector products so far.
+    """
+
+    count = [0]
+
+    def matvec(v):
+        count[0] += 1
+        return H @ v
+
+    return LinearOperator(H.shape, matvec=matvec, dtype=H.dtype), count
+
+
+class WarmStartSolver:
+    """
+        This is an eigensolver for sweeps of slowly changing Hamiltonians.
+        The k lowest eigenpairs are found with Lanczos started from the sum
+        of the previous lowest eigenvectors, and the largest eigenenergy
+        with Lanczos started from the previous highest eigenvector, so each
+        call starts close to the wanted subspace. The shift-invert Lanczos
+        around each tracked state likewise starts from the sum of its
+        previous window, but H - sigma changes with every experiment, so it
+        is still factorised every time. The work of every call is kept in
+        iterations: the products with H of the 'lowest' and 'top' stages,
+        the products with H and (H - sigma)^-1 of the 'nearest' stage, and
+        the number of 'factorised' matrices, i.e. sparse LU factorisations
+        and dense diagonalisations.
+
+    Parameters
+    ----------
+    k: int (Optional)
+        The number of lowest eigenpairs. Default is 6.
+    tol: float (Optional)
+        The relative accuracy of the eigenenergies, 0 for machine
+        precision. Default is 0.
+    """
+
+    def __init__(self, k=6, tol=0):
+        self.k = k
+        self.tol = tol
+        self.start = None
+        self.top_vector = None
+        self.windows = None
+        self.iterations = []
+
+    def solve(self, H, target=None, bases=None):
+        """
+            This method diagonalises the next Hamiltonian of the sweep.
+
+        Parameters
+        ----------
+        H: scipy sparse matrix
+            The Hamiltonian.
+        target: numpy array (Optional)
+            A state being tracked, or several states as columns, see
+            tracking_eigenpairs.
+        bases: list (Optional)
+            The symmetry sector of each tracked state, see
+            tracking_eigenpairs.
+
+        Returns
+        -------
+        energies, vectors, top:
+            See lowest_eigenpairs. If target is given, the eigenpairs
+            closest to it are included.
+        """
+
+        if self.k >= H.shape[0] - 1:
+            self.iterations.append({'lowest': 0, 'top': 0, 'nearest': 0, 'factorised': 1})
+            return full_eigenpairs(H)
+
+        if self.start is not None and len(self.start) != H.shape[0]:
+            self.start, self.top_vector, self.windows = None, None, None
+
+        operator, count = counting_operator(H)
+        energies, vectors = eigsh(operator, k=self.k, which='SA', v0=self.start, tol=self.tol)
+        order = np.argsort(energies)
+        energies, vectors = energies[order], vectors[:, order]
+        self.start = vectors.sum(axis=1)
+        lowest = count[0]
+
+        top, top_vector = eigsh(operator, k=1, which='LA', v0=self.top_vector, tol=self.tol)
+        self.top_vector = top_vector[:, 0]
+
+        nearest = [0, 0]
+        if target is not None:
+            energies, vectors, self.windows = tracking_eigenpairs(
+                H, self.k, target, (energies, vectors), bases, self.windows, nearest)
+        self.iterations.append({'lowest': lowest, 'top': count[0] - lowest,
+                                'nearest': nearest[0], 'factorised': nearest[1]})
+        return energies, vectors, top[0]
+
+
+def solve(H, solver='full', k=6, target=None, bases=None):
+    """
+        This function diagonalises the Hamiltonian with the chosen solver.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix or LinearOperator
+        The Hamiltonian, a LinearOperator only with 'matrix_free'.
+    solver: str (Optional)
+        'full' for a dense diagonalisation, or 'sparse' for the k lowest
+        eigenpairs only. 'matrix_free' is for an H given as a
+        LinearOperator, which cannot be factorised for shift-invert; it only
+        finds the k lowest eigenpairs, also with a target. Default is
+        'full'.
+    k: int (Optional)
+        The number of lowest eigenpairs of the 'sparse' solver. Default is 6.
+    target: numpy array (Optional)
+        A state being tracked, or several states as columns. The 'sparse'
+        solver then also returns the eigenpairs closest in energy to each,
+        at least k and enough to hold the eigenstate of largest overlap, see
+        tracking_eigenpairs. The 'matrix_free' solver raises if that
+        eigenstate may lie above the k lowest ones.
+    bases: list (Optional)
+        The symmetry sector of each tracked state, see tracking_eigenpairs.
+
+    Returns
+    -------
+    energies, vectors, top:
+        See full_eigenpairs and lowest_eigenpairs.
+
+    Raises
+    ------
+    ValueError
+        If the solver is unknown, or if the 'matrix_free' solver cannot
+        certify that each tracked state is followed to its eigenstate of
+        largest overlap, see is_resolved.
+    """
+
+    if solver == 'full':
+        return full_eigenpairs(H)
+    elif solver in ('sparse', 'matrix_free'):
+        energies, vectors, top = lowest_eigenpairs(H, k)
+        if target is None or k >= H.shape[0] - 1:
+            return energies, vectors, top
+        if solver == 'sparse':
+            energies, vectors, _ = tracking_eigenpairs(H, k, target, (energies, vectors), bases)
+        elif not all(is_resolved(column, vectors, slice(1, None))
+                     for column in np.asarray(target).reshape(H.shape[0], -1).T):
+            raise ValueError("A tracked state may not be among the %d lowest eigenpairs. Use "
+                             "a larger k or the 'sparse' solver." % k)
+        return energies, vectors, top
+    raise ValueError("Unknown solver '%s', choose from %s." % (solver, SOLVERS))
@@ -191,7 +191,7 @@ def total_hamiltonian_int(no_of_elec, V):
 
     H = 0
     for i in range(no_of_elec - 1):
-        H = hamiltonian_int(no_of_elec, i, V)
+        H = H + hamiltonian_int(no_of_elec, i, V)
     return H
 
 
@@ -1,6 +1,17 @@
 from numpy import sqrt, exp, pi, absolute
-from prettytable import PrettyTable
 from .hamiltonians import total_hamiltonian, hamiltonian_site_i
+from .sparse_hamiltonians import site_operator, interaction_diagonal
+from .operators import hamiltonian_operator
+from .operator_cache import load_operators
+from .eigensolvers import solve, WarmStartSolver
+from .symmetry import sector_candidates, sector_eigenpairs, enclosing_sector
+from collections import OrderedDict
+from scipy import sparse
+from .tracking import track_states
+from .parallel import parallel_levels
+from .results import sweep_result, result_table
+from .checkpoint import sweep_key, save_checkpoint, load_checkpoint, sweep_parameters
+from .result_cache import result_key
 from .model_helper import get_array
 from qutip import tensor, Qobj
 import numpy as np
@@ -100,6 +111,44 @@ class WireMaterial:
 
         return self.name
 
+    def length_scales(self, t, v):
+        """
+            This gives the length scales of the wire for arrays of
+            experiments.
+
+        Parameters
+        ----------
+        t: numpy array
+            The confinement energy in units of meV.
+        v: numpy array
+            The interaction strength between electrons in units of meV.
+
+        Returns
+        -------
+        width: numpy array
+            The wire width in nm.
+        r_0: numpy array
+            The interesting length scale r_0 in nm.
+        separation: numpy array
+            The electron separation in nm, nan without interaction.
+        """
+
+        t = np.asarray(t, dtype=float)
+        v = np.asarray(v, dtype=float)
+
+        # Calculating the wire width:
+        width = hbar / np.sqrt(self.get_eff_mass_e() * t * q * 10 ** (-3)) * 10 ** 9
+
+        # Calculating the interesting length scale, r0:
+        r_0 = (2 * q ** 2 * hbar ** 2 / (
+                self.get_dielec_cons() * self.get_eff_mass_e() *
+                (t * 10 ** (-3) * q) ** 2)) ** (1 / 3) * 10 ** 9
+
+        # Calculating electrons separation:
+        separation = np.divide(q, self.get_dielec_cons() * 10 ** (-3) * v,
+                               out=np.full(v.shape, np.nan), where=v != 0) * 10 ** 9
+        return width, r_0, separation
+
 
 ##############################################################################
 class InteractingModel:
@@ -125,17 +174,41 @@ class InteractingModel:
     conf_increase: bool (Optional)
         This indicates whether the confinement strength will increase
         each experiment.
+    dtype: data-type (Optional)
+        The data type of the Hamiltonians and eigenstates. They are real
+        symmetric, so float64 uses the real symmetric eigensolvers with half
+        the memory of complex128. float32 halves it again, with energies
+        accurate to about 1e-6 relative to the largest one. Default is
+        float64.
+    operator_cache: str (Optional)
+        The directory of the on-disk cache of the unit operators, see
+        operator_cache.py. Default is None, the operators are built in
+        memory.
     """
 
     def __init__(self, wire_material, no_of_elec, inter_rng,
-                 int_increase=True, conf_increase=True):
+                 int_increase=True, conf_increase=True, dtype=np.float64,
+                 operator_cache=None):
         self.wire_material = wire_material
         self.inter_rng = inter_rng
         self.no_of_elec = no_of_elec
         self.int_incr = int_increase
         self.conf_incr = conf_increase
+        self.dtype = np.dtype(dtype)
+        self.operator_cache = operator_cache
+        self.iterations = []
+        self.tracked_states = None
+        self.spectrum_cache_bytes = 64 * 2**20
+        self.spectrum_cache_hits = 0
+        self._unit_operators = None
+        self._int_diagonal = None
+        self._first_excited = None
+        self._spectra = OrderedDict()
 
     def get_1st_excited(self):
+        if self.operator_cache is not None:
+            self.unit_operators()
+            return Qobj(np.array(self._first_excited)[:, None])
         h_site_j = hamiltonian_site_i(1)
         first_ex_state = h_site_j.eigenstates()[1][1]
         full_state = []
@@ -145,69 +218,418 @@ class InteractingModel:
         full_state = Qobj(full_state)
         return full_state
 
-    def print_result(self, pt_freq, include_2nd=False):
+    def state_vector(self, state):
         """
-            This method generates the resulting energy levels of each
-            experiment.
+            This method gives a state as a flat numpy array of the model
+            dtype. Complex states are only kept complex if they have a
+            nonzero imaginary part.
+
+        Parameters
+        ----------
+        state: Qobj or numpy array
+            The 3^N state.
+
+        Returns
+        -------
+        state: numpy array
+            The state as a 3^N vector.
+        """
+
+        if isinstance(state, Qobj):
+            state = state.full()
+        state = np.real_if_close(np.ravel(state))
+        if np.iscomplexobj(state):
+            return state.astype(np.promote_types(self.dtype, state.dtype))
+        return state.astype(self.dtype)
+
+    def unit_operators(self):
+        """
+            This method gives the confinement Hamiltonian with t = 1 and the
+            diagonal of the interaction Hamiltonian with V = 1. They are
+            built once per model, as the total Hamiltonian is
+            t * H_site + V * H_int. With an operator_cache they are loaded
+            memory mapped from disk instead, see operator_cache.py.
+
+        Returns
+        -------
+        H_site: scipy.sparse.csr_matrix
+            The unit confinement Hamiltonian.
+        H_int: numpy array
+            The diagonal of the unit interaction Hamiltonian.
+        """
+
+        if self._unit_operators is None and self.operator_cache is not None:
+            H_site, H_int, self._first_excited = load_operators(
+                self.operator_cache, self.no_of_elec, self.dtype)
+            self._unit_operators = (H_site, H_int)
+        elif self._unit_operators is None:
+            self._unit_operators = (site_operator(self.no_of_elec, self.dtype),
+                                    interaction_diagonal(self.no_of_elec, self.dtype))
+        return self._unit_operators
+
+    def set_unit_operators(self, H_site, H_int):
+        """
+            This method sets the unit operators, e.g. when they are built for
+            several numbers of electrons at once, see multi_sweep.py.
+
+        Parameters
+        ----------
+        H_site: scipy.sparse.csr_matrix
+            The unit confinement Hamiltonian of no_of_elec electrons.
+        H_int: numpy array
+            The diagonal of the unit interaction Hamiltonian.
+
+        Returns
+        -------
+        None
+        """
+
+        if H_site.shape[0] != 3 ** self.no_of_elec:
+            raise ValueError("The operators are not of %d electrons." % self.no_of_elec)
+        self._unit_operators = (H_site.astype(self.dtype, copy=False).tocsr(),
+                                np.asarray(H_int, dtype=self.dtype))
+        self._int_diagonal = self._unit_operators[1]
+        self._spectra.clear()
+
+    def hamiltonian(self, t, v):
+        """
+            This method gives the total Hamiltonian of one experiment.
+
+        Parameters
+        ----------
+        t: float
+            The confinement energy. It is in units of meV.
+        v: float
+            The interaction strength between electrons in units of meV.
+
+        Returns
+        -------
+        H: scipy.sparse.csr_matrix
+            The 3^N x 3^N total Hamiltonian.
+        """
+
+        H_site, H_int = self.unit_operators()
+        return (self.dtype.type(t) * H_site +
+                sparse.diags(self.dtype.type(v) * H_int)).tocsr()
+
+    def hamiltonian_operator(self, t, v):
+        """
+            This method gives the total Hamiltonian of one experiment as a
+            matrix free LinearOperator, see operators.py.
+
+        Parameters
+        ----------
+        t: float
+            The confinement energy. It is in units of meV.
+        v: float
+            The interaction strength between electrons in units of meV.
+
+        Returns
+        -------
+        H: scipy.sparse.linalg.LinearOperator
+            The 3^N x 3^N total Hamiltonian.
+        """
+
+        if self._int_diagonal is None and self.operator_cache is not None:
+            self._int_diagonal = self.unit_operators()[1]
+        elif self._int_diagonal is None:
+            self._int_diagonal = interaction_diagonal(self.no_of_elec, self.dtype)
+        return hamiltonian_operator(self.no_of_elec, t, v, self.dtype,
+                                    diagonal=self._int_diagonal)
+
+    def _unit_spectrum(self, ratio, solver, vectors=True):
+        """
+            This method diagonalises the Hamiltonian with t = 1 and V = ratio.
+            The spectra are kept in a least recently used cache of at most
+            spectrum_cache_bytes, 0 to disable it. A spectrum larger than the
+            cap, e.g. the dense eigenvectors at large N, is not kept. When
+            the eigenvectors are not needed, only the eigenvalues are found
+            and kept.
+        """
+
+        key = (solver, ratio)
+        spectrum = self._spectra.get(key)
+        if spectrum is not None and (not vectors or self._spectrum_bytes(spectrum)[1]):
+            self._spectra.move_to_end(key)
+            self.spectrum_cache_hits += 1
+            return spectrum
+
+        h = self.hamiltonian(1, ratio)
+        if solver == 'symmetry':
+            spectrum = sector_eigenpairs(h, self.no_of_elec, vectors)
+        elif vectors:
+            spectrum = solve(h, solver)
+        else:
+            energies = np.linalg.eigvalsh(h.toarray())
+            spectrum = (energies, None, energies[-1])
+
+        self._spectra.pop(key, None)
+        if self._spectrum_bytes(spectrum)[0] <= self.spectrum_cache_bytes:
+            self._spectra[key] = spectrum
+        while sum(self._spectrum_bytes(cached)[0] for cached in self._spectra.values()) > \
+                self.spectrum_cache_bytes:
+            self._spectra.popitem(last=False)
+        return spectrum
+
+    @staticmethod
+    def _spectrum_bytes(spectrum):
+        """
+            This method gives the memory of a cached spectrum, and whether it
+            holds the eigenvectors.
+        """
+
+        blocks = spectrum.values() if isinstance(spectrum, dict) else [spectrum]
+        size = sum(block[0].nbytes + (0 if block[1] is None else block[1].nbytes)
+                   for block in blocks)
+        return size, all(block[1] is not None for block in blocks)
+
+    def _sectors_of(self, state):
+        """
+            This method gives the basis of the symmetry sector of each
+            tracked state, or None, see symmetry.enclosing_sector.
+        """
+
+        if state is None:
+            return None
+        states = np.asarray(state).reshape(3 ** self.no_of_elec, -1)
+        return [enclosing_sector(column, self.no_of_elec) for column in states.T]
+
+    def tracking_candidates(self, t, v, state, solver='full', k=6):
+        """
+            This method diagonalises the Hamiltonian of one experiment and
+            gives the eigenstates the 1st excited state may be tracked to,
+            i.e. all but the ground state and the highest state.
+
+            With the 'full' and 'symmetry' solvers and t > 0, the spectrum
+            only depends on V/t up to the factor t, so it is computed at
+            t = 1 and cached; experiments sharing a ratio reuse it, see
+            _unit_spectrum.
+
+        Parameters
+        ----------
+        t: float
+            The confinement energy. It is in units of meV.
+        v: float
+            The interaction strength between electrons in units of meV.
+        state: numpy array or None
+            The currently tracked state, or several states as columns. If
+            None, only e_g and e_2 are needed, and the candidates of the
+            'sparse', 'warm', 'symmetry' and 'matrix_free' solvers may be
+            left out.
+        solver: str or WarmStartSolver (Optional)
+            'full', 'sparse', 'symmetry' or 'matrix_free', see print_result,
+            or the WarmStartSolver of the running sweep.
+        k: int (Optional)
+            The number of eigenpairs of the 'sparse' and 'matrix_free'
+            solvers.
+
+        Returns
+        -------
+        e_g: float
+            The ground state energy.
+        e_2: float
+            The highest energy.
+        energies: numpy array
+            The energies of the candidate states.
+        vectors: numpy array
+            The candidate states, as columns.
+        """
+
+        if solver in ('full', 'symmetry') and t > 0:
+            spectrum = self._unit_spectrum(round(v / t, 12), solver, state is not None)
+            if solver == 'symmetry':
+                e_g, e_2, energies, vectors = sector_candidates(
+                    None, self.no_of_elec, state, blocks=spectrum)
+                return e_g * t, e_2 * t, energies * t, vectors
+            eigenenergies, eigenstates, e_2 = spectrum
+            eigenenergies, e_2 = eigenenergies * t, e_2 * t
+            if eigenstates is None:
+                return eigenenergies[0], e_2, eigenenergies[:0], np.zeros((len(eigenenergies), 0))
+        elif isinstance(solver, WarmStartSolver):
+            eigenenergies, eigenstates, e_2 = solver.solve(
+                self.hamiltonian(t, v), target=state, bases=self._sectors_of(state))
+        elif solver == 'symmetry':
+            return sector_candidates(self.hamiltonian(t, v), self.no_of_elec, state)
+        elif solver == 'matrix_free':
+            eigenenergies, eigenstates, e_2 = solve(
+                self.hamiltonian_operator(t, v), solver, k, target=state)
+        else:
+            eigenenergies, eigenstates, e_2 = solve(
+                self.hamiltonian(t, v), solver, k, target=state,
+                bases=self._sectors_of(state))
+        candidates = slice(1, min(len(eigenenergies), 3 ** self.no_of_elec - 1))
+        return eigenenergies[0], e_2, eigenenergies[candidates], eigenstates[:, candidates]
+
+    def track_levels(self, pt_freq, states=None, solver='full', k=6):
+        """
+            This method follows several eigenstates through the experiments
+            at once. At every experiment, each tracked state is assigned to a
+            different eigenstate so that the total overlap with the previous
+            states is largest. The ground state and the highest state are
+            never assigned.
 
         Parameters
         ----------
         pt_freq: int
             This gives the number of experiments we want to conduct.
-        include_2nd: bool
-            This denotes whether to include the 2nd excited state in the
-            energy band diagram.
+        states: list (Optional)
+            The initial states to track, as Qobj or numpy arrays. Default is
+            the 1st excited state without interaction, see get_1st_excited.
+        solver: str (Optional)
+            'full', 'sparse', 'symmetry' or 'warm', see print_result, or
+            'matrix_free', which finds the k lowest eigenpairs and the
+            largest eigenenergy without storing the Hamiltonian, see
+            operators.py, and tracks the states among those k states only.
+            It is meant for low lying states when the matrix does not fit
+            in memory, and raises a ValueError when a tracked state may lie
+            above the k states.
+        k: int (Optional)
+            The number of eigenpairs of the 'sparse', 'warm' and
+            'matrix_free' solvers.
+            Default is 6.
 
         Returns
         -------
-        energies: array with 3 nested numpy array
-                i.e. array = [np.array, np.array, np.array]
-            This array contains 3 numpy arrays corresponding to the ground
-            state, 1st excited state and the 2nd excited state energies.
-            For example, energies[i][j] corresponds to the jth experiment
-            of the ith energy level.
-        x: array
+        energies: numpy array
+            energies[i][j] is the energy of the ith tracked state in the jth
+            experiment.
+        x: numpy array
             This corresponds to the ratio of interaction and confinement (v/t)
             for each experiment.
         """
 
-        # Initialise table:
-        table = PrettyTable()
-        table.field_names = ['V_int (meV)', 'V_conf (meV)', 'V_int/V_conf ()',
-                             'Electron Sep (nm)', 'Wire width (nm)',
-                             'r_0 (nm)', 'e_g (meV)', 'e_1 (meV)',
-                             'e_2 (meV)']
+        if states is None:
+            states = [self.get_1st_excited()]
+        tracked = np.column_stack([self.state_vector(state) for state in states])
+
+        int_strength = get_array(self.inter_rng, pt_freq, self.int_incr)
+        conf_strength = get_array(self.wire_material.get_conf_rng(),
+                                  pt_freq, self.conf_incr)
+
+        if solver == 'warm':
+            solver = WarmStartSolver(k)
+            self.iterations = solver.iterations
+
+        energies = np.zeros((tracked.shape[1], pt_freq))
+        for i in range(pt_freq):
+            _, _, eigenenergies, eigenstates = self.tracking_candidates(
+                conf_strength[i], int_strength[i], tracked, solver, k)
+            _, energies[:, i], tracked = track_states(
+                tracked, eigenenergies, eigenstates)
+
+        return energies, int_strength / conf_strength
+
+    def compute(self, pt_freq, solver='full', k=6, workers=None, progress=False,
+                checkpoint=None, checkpoint_every=10, cache=None, keep_states=False,
+                max_bytes=256 * 2**20):
+        """
+            This method computes the energy levels and length scales of each
+            experiment without printing anything.
+
+        Parameters
+        ----------
+        pt_freq: int
+            This gives the number of experiments we want to conduct.
+        solver: str (Optional)
+            See print_result. Default is 'full'.
+        k: int (Optional)
+            See print_result. Default is 6.
+        workers: int (Optional)
+            See print_result. Default is None, one process.
+        progress: bool (Optional)
+            Whether to show a progress bar. Default is False.
+        checkpoint: str (Optional)
+            A .npz file the progress is saved to, see checkpoint.py. If it
+            already holds a checkpoint of the same sweep, the sweep continues
+            from there with the same tracked state. Not supported with
+            several workers. Default is None.
+        checkpoint_every: int (Optional)
+            The number of experiments between checkpoints. Default is 10.
+        cache: ResultCache (Optional)
+            A cache of sweep results, see result_cache.py. A cached sweep is
+            loaded instead of computed, otherwise the result and the tracked
+            states are stored after the sweep. Default is None.
+        keep_states: bool (Optional)
+            Whether to keep the tracked 1st excited state of each experiment
+            in tracked_states. They are not kept with several workers or
+            when resuming a checkpoint. Default is False.
+        max_bytes: int (Optional)
+            See print_result. Default is 256 MiB.
+
+        Returns
+        -------
+        result: numpy recarray
+            One record per experiment with the fields V, t, ratio, e_g, e_1,
+            e_2, width, r_0 and separation, see results.py.
+        """
+
+        if solver == 'matrix_free':
+            raise ValueError("The 'matrix_free' solver only follows low lying states, "
+                             "see track_levels.")
+
+        # Loading or storing the result in the cache:
+        if cache is not None:
+            key = result_key(self, pt_freq, solver, k)
+            result, self.tracked_states = cache.get(key)
+            self.iterations = []
+            if result is None:
+                result = self.compute(pt_freq, solver, k, workers, progress,
+                                      checkpoint, checkpoint_every, keep_states=True,
+                                      max_bytes=max_bytes)
+                cache.put(key, result, self.tracked_states)
+            return result
 
         # Set up the interaction strength and confinement strength:
         int_strength = get_array(self.inter_rng, pt_freq, self.int_incr)
         conf_strength = get_array(self.wire_material.get_conf_rng(),
                                   pt_freq, self.conf_incr)
+        self.tracked_states = None
 
-        # Initialise arrays:
-        x = []
-        energy0 = []
-        energy1 = []
-        energy2 = []
+        # With several workers, all experiments are diagonalised first:
+        if workers is not None and workers > 1:
+            if solver != 'full':
+                raise ValueError("Only the 'full' solver runs on several workers.")
+            if checkpoint is not None:
+                raise ValueError("Checkpoints are not supported with several workers.")
+            levels, _ = parallel_levels(self, pt_freq, workers, max_bytes)
+            return sweep_result(self.wire_material, int_strength, conf_strength, levels)
 
         # Initial first excited state (without interaction):
-        first_ex_state = self.get_1st_excited()
-
-        # Plotting and table printing:
-        for i in tqdm.tqdm(range(pt_freq)):
-            # Retrieving energies strength and Hamiltonian:
+        first_ex_state = self.state_vector(self.get_1st_excited())
+        levels = np.zeros((3, pt_freq))
+        start = 0
+
+        # Continuing a checkpoint of the same sweep:
+        saved = None
+        if checkpoint is not None:
+            key = sweep_key(self, pt_freq, solver, k)
+            saved = load_checkpoint(checkpoint, key)
+        if saved is not None:
+            start, levels, first_ex_state = saved['index'], saved['levels'], saved['state']
+
+        # The warm started solver is shared by the whole sweep:
+        if solver == 'warm':
+            solver = WarmStartSolver(k)
+            self.iterations = solver.iterations
+            if saved is not None and 'warm_start' in saved:
+                solver.start, solver.top_vector = saved['warm_start'], saved['warm_top']
+
+        if keep_states and start == 0:
+            self.tracked_states = np.zeros((pt_freq, len(first_ex_state)), dtype=first_ex_state.dtype)
+
+        points = range(start, pt_freq)
+        if progress:
+            points = tqdm.tqdm(points, initial=start, total=pt_freq)
+        for i in points:
+            # Retrieving energies strength:
             v = int_strength[i]
             t = conf_strength[i]
-            h = total_hamiltonian(self.no_of_elec, t, v)
-
-            # Calculate and retrieve the eigenstates and its
-            # corresponding energies:
-            eigenstates = h.eigenstates()
-            eigenenergies = eigenstates[0]
-            eigenstates = eigenstates[1]
 
-            # The ground state and the 2nd excited state are trivial:
-            e_g = eigenenergies[0]
-            e_2 = eigenenergies[3 ** self.no_of_elec - 1]
+            # Calculate the ground state and highest energies, and the
+            # eigenstates that the 1st excited state may be tracked to. The
+            # 1st excited state is not tracked at the first experiment:
+            e_g, e_2, eigenenergies, eigenstates = self.tracking_candidates(
+                t, v, first_ex_state if i > 0 else None, solver, k)
 
             # Calculating the  1st excited state:
             # If i is 0, we know that there are no interactions
@@ -218,56 +640,118 @@ class InteractingModel:
             # previous chosen state and choose the new state as one with
             # most overlapping with the old one:
             else:
-                # Calculating the magnitude of the overlapping:
-                max_overlap = abs(eigenstates[1].overlap(first_ex_state))
-                max_overlap_index = 1  # Setting the initial index:
-                for j in range(2, 3 ** self.no_of_elec - 1):
-                    overlap = abs(eigenstates[j].overlap(first_ex_state))
-
-                    # If there are more overlapping, we replace this as the
-                    # new chosen state:
-                    if overlap > max_overlap:
-                        max_overlap = overlap
-                        max_overlap_index = j
-
-                # Setting the final chosen eigenstate:
-                e_1 = eigenenergies[max_overlap_index]
-                first_ex_state = eigenstates[max_overlap_index]
+                _, e_1, first_ex_state = track_states(
+                    first_ex_state, eigenenergies, eigenstates)
+                e_1 = e_1[0]
+                first_ex_state = first_ex_state[:, 0]
 
             # Storing the data of the 3 important energies:
-            energy0.append(e_g)
-            energy1.append(e_1)
-            energy2.append(e_2)
-
-            # Calculating the wire width:
-            w = hbar / np.sqrt(
-                self.wire_material.get_eff_mass_e()
-                * t * q * 10 ** (-3)) * 10 ** 9
-
-            # Calculating the interesting length scale, r0:
-            r_0 = (2 * q ** 2 * hbar ** 2 / (
-                    self.wire_material.get_dielec_cons()
-                    * self.wire_material.get_eff_mass_e() *
-                    (t * 10 ** (-3) * q) ** 2)) ** (1 / 3) * 10 ** 9
-
-            # Calculating electrons separation:
-            if v == 0:
-                r = 'No interaction'
-            else:
-                r = q / (self.wire_material.get_dielec_cons()
-                         * 10 ** (-3) * v) * 10 ** 9
+            levels[:, i] = e_g, e_1, e_2
+            if self.tracked_states is not None:
+                self.tracked_states[i] = first_ex_state
+
+            # Saving the progress:
+            if checkpoint is not None and ((i + 1) % checkpoint_every == 0 or i + 1 == pt_freq):
+                warm = (solver.start, solver.top_vector) \
+                    if isinstance(solver, WarmStartSolver) else None
+                save_checkpoint(checkpoint, key, i + 1, levels, first_ex_state, warm)
+
+        # The length scales are found for all experiments at once:
+        return sweep_result(self.wire_material, int_strength, conf_strength, levels)
+
+    def resume(self, checkpoint, progress=False, checkpoint_every=10):
+        """
+            This method continues a sweep from its checkpoint, with the
+            number of experiments and the solver stored in it.
+
+        Parameters
+        ----------
+        checkpoint: str
+            The checkpoint file written by compute.
+        progress: bool (Optional)
+            Whether to show a progress bar. Default is False.
+        checkpoint_every: int (Optional)
+            The number of experiments between checkpoints. Default is 10.
+
+        Returns
+        -------
+        result: numpy recarray
+            See compute.
+        """
+
+        parameters = sweep_parameters(checkpoint)
+        return self.compute(parameters['pt_freq'], parameters['solver'], parameters['k'],
+                            progress=progress, checkpoint=checkpoint,
+                            checkpoint_every=checkpoint_every)
+
+    def print_result(self, pt_freq, include_2nd=False, solver='full', k=6,
+                     workers=None, checkpoint=None, cache=None, max_bytes=256 * 2**20):
+        """
+            This method generates the resulting energy levels of each
+            experiment.
+
+        Parameters
+        ----------
+        pt_freq: int
+            This gives the number of experiments we want to conduct.
+        include_2nd: bool
+            This denotes whether to include the 2nd excited state in the
+            energy band diagram.
+        solver: str (Optional)
+            'full' diagonalises the whole Hamiltonian at each point. 'sparse'
+            only finds the k lowest eigenpairs and the largest eigenenergy
+            with the Lanczos method, and the eigenpairs closest in energy to
+            the tracked 1st excited state with shift-invert Lanczos in its
+            symmetry sector. That window starts at k states and widens until
+            it certainly holds the state of largest overlap, so the energies
+            match 'full'; where the tracked state is spread over many
+            states, the sector is diagonalised fully. 'symmetry' diagonalises
+            each (reflection, parity) sector separately and tracks the 1st
+            excited state within its own sector, see symmetry.py. The
+            1st excited state lies inside the spectrum, so the
+            'matrix_free' solver of track_levels is not supported. Default
+            is 'full'.
+        k: int (Optional)
+            The number of eigenpairs in each group of the 'sparse' and
+            'warm' solvers.
+            Default is 6.
+        workers: int (Optional)
+            If more than 1, the experiments are diagonalised on this many
+            processes, in chunks of consecutive experiments, and the 1st
+            excited state is tracked as the chunks come back, see
+            parallel.py. Only the 'full' solver is supported. Default is
+            None, one process.
+        checkpoint: str (Optional)
+            A file to save the progress to and resume from, see compute.
+            Default is None.
+        cache: ResultCache (Optional)
+            A cache of sweep results, see compute. Default is None.
+        max_bytes: int (Optional)
+            The memory budget of the results the workers send back and that
+            are not yet tracked, see parallel.py. Default is 256 MiB.
 
-            # Update table:
-            table.add_row([v, t, v / t, r, w, r_0, e_g, e_1, e_2])
+        Returns
+        -------
+        energies: array with 3 nested numpy array
+                i.e. array = [np.array, np.array, np.array]
+            This array contains 3 numpy arrays corresponding to the ground
+            state, 1st excited state and the 2nd excited state energies.
+            For example, energies[i][j] corresponds to the jth experiment
+            of the ith energy level.
+        x: array
+            This corresponds to the ratio of interaction and confinement (v/t)
+            for each experiment.
+        """
 
-            # Update independent variable, ratio of int and conf:
-            x.append(v / t)
+        # Compute the sweep, see compute:
+        result = self.compute(pt_freq, solver, k, workers, progress=True,
+                              checkpoint=checkpoint, cache=cache, max_bytes=max_bytes)
 
         # Putting energies together as an array:
-        energies = [energy0, energy1]
+        energies = [result.e_g.tolist(), result.e_1.tolist()]
 
         if include_2nd is True:
-            energies.append(energy2)
+            energies.append(result.e_2.tolist())
 
         # Output data table:
         # Printing information on set-up:
@@ -281,12 +765,28 @@ class InteractingModel:
               self.wire_material.get_dielec_factor(), "epsilon_0")
         print("- e- eff mass        :",
               self.wire_material.get_eff_mass_factor(), "m_e")
+        # Only the experiments solved by this call are counted, the others
+        # were loaded from the cache or a checkpoint:
+        if solver == 'warm' and not self.iterations:
+            print("Lanczos products with H or (H - sigma)^-1: none, the sweep was loaded")
+        elif solver == 'warm':
+            products = [count['lowest'] + count['top'] + count['nearest']
+                        for count in self.iterations]
+            first = pt_freq - len(products)
+            print("Lanczos products with H or (H - sigma)^-1 per experiment:")
+            if first == 0:
+                print("- first experiment   :", products[0])
+            else:
+                print("- resumed at index", first, ":", products[0])
+            print("- mean of the others :", np.mean(products[1:]) if len(products) > 1 else '-')
+            print("Factorisations and dense diagonalisations:",
+                  sum(count['factorised'] for count in self.iterations))
         print("##########################################################")
         print("")
         print("")
 
         # Printing table:
-        print(table)
+        print(result_table(result))
 
         # return energies
-        return energies, x
+        return energies, result.ratio.tolist()
@@ -0,0 +1,100 @@
+from .sparse_hamiltonians import extend_operators
+from .model import InteractingModel
+from prettytable import PrettyTable
+import numpy as np
+import time
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and prettytable.
+
+    Description:
+    This file runs the same sweep for several numbers of electrons in one
+    job. The unit operators are built once, adding one site at a time with
+    extend_operators, so the operators of N electrons reuse those of N - 1.
+    The time spent building and sweeping each N is kept in a scaling report.
+'''
+
+REPORT_DTYPE = np.dtype([('N', np.int64), ('dimension', np.int64),
+                         ('build_time', np.float64), ('sweep_time', np.float64)])
+
+
+def multi_sweep(wire_material, electron_counts, inter_rng, pt_freq, solver='full', k=6,
+                int_increase=True, conf_increase=True, dtype=np.float64):
+    """
+        This function runs a sweep for every number of electrons requested.
+
+    Parameters
+    ----------
+    wire_material: WireMaterial (class)
+        The material of the wire.
+    electron_counts: list of int
+        The numbers of electrons.
+    inter_rng: tuple (float, float)
+        The range of interaction energy in units of meV, see
+        InteractingModel.
+    pt_freq: int
+        This gives the number of experiments of each sweep.
+    solver: str (Optional)
+        See InteractingModel.print_result. Default is 'full'.
+    k: int (Optional)
+        See InteractingModel.print_result. Default is 6.
+    int_increase, conf_increase: bool (Optional)
+        See InteractingModel. Default is True.
+    dtype: data-type (Optional)
+        See InteractingModel. Default is float64.
+
+    Returns
+    -------
+    results: dict
+        Maps each number of electrons to its result, see
+        InteractingModel.compute.
+    report: numpy recarray
+        One record per number of electrons with the fields N, dimension,
+        build_time and sweep_time, in seconds. The build time of N is the
+        time to extend the operators from the previous requested N.
+    """
+
+    electron_counts = sorted(set(electron_counts))
+    results = {}
+    report = np.zeros(len(electron_counts), dtype=REPORT_DTYPE).view(np.recarray)
+
+    H_site, H_int = None, None
+    no_of_elec = 0
+    for i, target in enumerate(electron_counts):
+        start = time.perf_counter()
+        while no_of_elec < target:
+            H_site, H_int = extend_operators(H_site, H_int, dtype)
+            no_of_elec += 1
+        built = time.perf_counter()
+
+        model = InteractingModel(wire_material, target, inter_rng, int_increase,
+                                 conf_increase, dtype)
+        model.set_unit_operators(H_site, H_int)
+        results[target] = model.compute(pt_freq, solver, k)
+
+        report[i] = target, 3 ** target, built - start, time.perf_counter() - built
+    return results, report
+
+
+def scaling_table(report):
+    """
+        This function renders the scaling report of multi_sweep as a table.
+
+    Parameters
+    ----------
+    report: numpy recarray
+        The report of multi_sweep.
+
+    Returns
+    -------
+    table: PrettyTable
+        One row per number of electrons.
+    """
+
+    table = PrettyTable()
+    table.field_names = ['N', 'Dimension', 'Build time (s)', 'Sweep time (s)']
+    for record in report:
+        table.add_row([record['N'], record['dimension'], record['build_time'], record['sweep_time']])
+    return table
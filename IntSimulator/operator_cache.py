@@ -0,0 +1,159 @@
+from .sparse_hamiltonians import site_operator, interaction_diagonal, SITE_UNIT
+from .hamiltonians import hamiltonian_site_i
+from functools import reduce
+from scipy import sparse
+import numpy as np
+import tempfile
+import shutil
+import os
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and scipy.sparse.
+
+    Description:
+    This file keeps the unit operators of InteractingModel on disk, so new
+    sessions and worker processes load them instead of building them again.
+    The operators of N electrons are stored in their own directory, one .npy
+    file per array:
+        - site_data.npy, site_indices.npy, site_indptr.npy: the CSR arrays
+          of the unit confinement Hamiltonian, see site_operator,
+        - interaction.npy: the unit interaction diagonal,
+        - first_excited.npy: the 1st excited state without interaction.
+    The directory name holds N, the data type and BASIS_VERSION, which must
+    be increased whenever the basis or the operators change. The .npy files
+    are opened memory mapped, so processes loading the same operators share
+    the pages.
+'''
+
+BASIS_VERSION = 1
+
+OPERATOR_FILES = ('site_data', 'site_indices', 'site_indptr', 'interaction', 'first_excited')
+
+
+def operator_cache_path(directory, no_of_elec, dtype=np.float64):
+    """
+        This function gives the directory holding the cached operators.
+
+    Parameters
+    ----------
+    directory: str
+        The root directory of the cache.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    dtype: data-type (Optional)
+        The data type of the operators. Default is float64.
+
+    Returns
+    -------
+    path: str
+        The directory of the operators of N electrons.
+    """
+
+    return os.path.join(directory, 'N%d_%s_v%d' % (no_of_elec, np.dtype(dtype).name, BASIS_VERSION))
+
+
+def first_excited_state(no_of_elec, dtype=np.float64):
+    """
+        This function gives the 1st excited state without interaction, the
+        product of the 1st excited single site states, as in
+        InteractingModel.get_1st_excited.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    dtype: data-type (Optional)
+        The data type of the state. Default is float64.
+
+    Returns
+    -------
+    state: numpy array
+        The 3^N state.
+    """
+
+    single = np.real_if_close(hamiltonian_site_i(1).eigenstates()[1][1].full().ravel())
+    return reduce(np.kron, [single] * no_of_elec).astype(dtype)
+
+
+def build_operators(directory, no_of_elec, dtype=np.float64):
+    """
+        This function builds the unit operators of N electrons and writes
+        them to the cache. They are written to a temporary directory first
+        and then moved in place, so other processes never see a partial
+        entry.
+
+    Parameters
+    ----------
+    directory: str
+        The root directory of the cache.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    dtype: data-type (Optional)
+        The data type of the operators. Default is float64.
+
+    Returns
+    -------
+    path: str
+        The directory of the operators of N electrons.
+    """
+
+    path = operator_cache_path(directory, no_of_elec, dtype)
+    os.makedirs(directory, exist_ok=True)
+    H_site = site_operator(no_of_elec, dtype)
+    arrays = {'site_data': H_site.data, 'site_indices': H_site.indices,
+              'site_indptr': H_site.indptr,
+              'interaction': interaction_diagonal(no_of_elec, dtype),
+              'first_excited': first_excited_state(no_of_elec, dtype)}
+
+    temporary = tempfile.mkdtemp(dir=directory, prefix='.building_')
+    try:
+        for name in OPERATOR_FILES:
+            np.save(os.path.join(temporary, name + '.npy'), arrays[name])
+        os.rename(temporary, path)
+    except OSError:
+        # Another process has written the same entry first:
+        shutil.rmtree(temporary, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+    return path
+
+
+def load_operators(directory, no_of_elec, dtype=np.float64, mmap_mode='r'):
+    """
+        This function loads the unit operators of N electrons from the cache,
+        building them first if they are not there.
+
+    Parameters
+    ----------
+    directory: str
+        The root directory of the cache.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    dtype: data-type (Optional)
+        The data type of the operators. Default is float64.
+    mmap_mode: str (Optional)
+        The memory map mode of numpy.load, None to read the arrays into
+        memory. Default is 'r'.
+
+    Returns
+    -------
+    H_site: scipy.sparse.csr_matrix
+        The unit confinement Hamiltonian, see site_operator.
+    H_int: numpy array
+        The diagonal of the unit interaction Hamiltonian.
+    first_excited: numpy array
+        The 1st excited state without interaction.
+    """
+
+    path = operator_cache_path(directory, no_of_elec, dtype)
+    if not os.path.isdir(path):
+        build_operators(directory, no_of_elec, dtype)
+
+    arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)
+              for name in OPERATOR_FILES}
+    dim = SITE_UNIT.shape[0] ** no_of_elec
+    H_site = sparse.csr_matrix((arrays['site_data'], arrays['site_indices'], arrays['site_indptr']),
+                               shape=(dim, dim))
+    return H_site, arrays['interaction'], arrays['first_excited']
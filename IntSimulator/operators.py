@@ -0,0 +1,88 @@
+from scipy.sparse.linalg import LinearOperator
+from .sparse_hamiltonians import SITE_UNIT, interaction_diagonal
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and scipy.sparse.linalg.
+
+    Description:
+    This file applies the N electron Hamiltonian without storing it. The
+    state is reshaped to a (3,)*N tensor and the single site Hamiltonian is
+    contracted with one axis at a time, while the interaction, being
+    diagonal, is a single 3^N vector. Only a few vectors of length 3^N are
+    kept, so N is limited by the size of a state rather than of a matrix.
+'''
+
+
+def apply_site_operator(h, psi, no_of_elec):
+    """
+        This function applies the Kronecker sum of a single site operator,
+        sum_i I x ... x h_i x ... x I, to one or more states.
+
+    Parameters
+    ----------
+    h: numpy array
+        The 3 x 3 single site operator.
+    psi: numpy array
+        A 3^N state, or several states as columns.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+
+    Returns
+    -------
+    result: numpy array
+        The states after applying the operator, with the shape of psi.
+    """
+
+    columns = psi.size // 3 ** no_of_elec
+    result = np.zeros(psi.shape, dtype=np.result_type(h, psi))
+    for i in range(no_of_elec):
+        # Site i is the middle axis, the sites after it and the columns
+        # are merged into the last axis:
+        shape = (3 ** i, 3, 3 ** (no_of_elec - i - 1) * columns)
+        result.reshape(shape)[...] += np.einsum('ab,ibj->iaj', h, psi.reshape(shape))
+    return result
+
+
+def hamiltonian_operator(no_of_elec, t, V, dtype=np.float64, diagonal=None):
+    """
+        This function gives total Hamiltonian of a N particle system as a
+        LinearOperator, which applies the Hamiltonian by tensor contractions
+        instead of a stored matrix.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    t: float
+        The confinement energy. It is in units of meV.
+    V: float
+        The interaction strength between electrons in units of meV.
+    dtype: data-type (Optional)
+        The data type of the operator. Default is float64.
+    diagonal: numpy array (Optional)
+        The output of interaction_diagonal, if already computed.
+
+    Returns
+    -------
+    H: scipy.sparse.linalg.LinearOperator
+        The 3^N x 3^N total Hamiltonian. It is real symmetric.
+    """
+
+    h = (float(t) * SITE_UNIT).astype(dtype)
+    if diagonal is None:
+        diagonal = interaction_diagonal(no_of_elec, dtype)
+    interaction = (float(V) * diagonal).astype(dtype)
+    dim = 3 ** no_of_elec
+
+    def matmat(psi):
+        psi = np.asarray(psi).reshape(dim, -1)
+        return apply_site_operator(h, psi, no_of_elec) + interaction[:, None] * psi
+
+    def matvec(psi):
+        return matmat(psi).ravel()
+
+    return LinearOperator((dim, dim), matvec=matvec, matmat=matmat, rmatvec=matvec,
+                          rmatmat=matmat, dtype=np.dtype(dtype))
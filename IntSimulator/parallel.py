@@ -0,0 +1,191 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from .sparse_hamiltonians import sparse_total_hamiltonian
+from .operator_cache import load_operators
+from scipy import sparse
+from .model_helper import get_array
+import numpy as np
+import os
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and the standard library
+        concurrent.futures.
+
+    Description:
+    This file diagonalises the experiments of an InteractingModel sweep in
+    parallel. Tracking the 1st excited state needs the previous experiment,
+    but only through the overlaps of its eigenstates with the new ones. So
+    each worker diagonalises a chunk of consecutive experiments, together
+    with the experiment before the chunk, and sends back the energies and,
+    for every eigenstate of the experiment before, the index of the new
+    eigenstate of largest overlap. No eigenvectors leave the workers. The
+    main process then follows these indices in experiment order while the
+    later chunks are still diagonalised.
+'''
+
+
+def _diagonalise(no_of_elec, t, v, dtype, operator_cache=None):
+    """
+        This function diagonalises one experiment, with the unit operators
+        of the operator cache if given.
+    """
+
+    if operator_cache is not None:
+        H_site, H_int, _ = load_operators(operator_cache, no_of_elec, dtype)
+        scalar = np.dtype(dtype).type
+        H = scalar(t) * H_site + sparse.diags(scalar(v) * H_int)
+    else:
+        H = sparse_total_hamiltonian(no_of_elec, t, v, dtype=dtype)
+    return np.linalg.eigh(H.toarray())
+
+
+def _track_chunk(no_of_elec, t, v, dtype, previous, operator_cache=None):
+    """
+        This is the worker of parallel_levels, it diagonalises a chunk of
+        consecutive experiments.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        The number of electrons.
+    t, v: numpy array
+        The confinement and interaction strengths of the chunk.
+    dtype: data-type
+        The data type of the Hamiltonian.
+    previous: numpy array or tuple (float, float)
+        The states the first experiment follows as columns, or the
+        confinement and interaction strengths of the experiment before the
+        chunk, whose eigenstates are followed.
+    operator_cache: str (Optional)
+        See InteractingModel. Default is None.
+
+    Returns
+    -------
+    energies: numpy array
+        energies[i] are the eigenenergies of the ith experiment.
+    moves: list of numpy array
+        moves[i][j] is the eigenstate of the ith experiment, other than the
+        ground state and the highest one, of largest overlap with the jth
+        state followed from the experiment before.
+    """
+
+    if isinstance(previous, tuple):
+        _, previous = _diagonalise(no_of_elec, *previous, dtype, operator_cache)
+
+    energies = np.zeros((len(t), 3 ** no_of_elec))
+    moves = []
+    for i in range(len(t)):
+        energies[i], vectors = _diagonalise(no_of_elec, t[i], v[i], dtype, operator_cache)
+        moves.append(np.argmax(np.abs(previous.conj().T @ vectors[:, 1:-1]), axis=1) + 1)
+        previous = vectors
+    return energies, moves
+
+
+def chunk_size(dim, pt_freq, workers, max_bytes):
+    """
+        This function gives the number of experiments of each chunk, so that
+        every worker gets work and the results of the chunks in flight, two
+        per worker, fit in the memory budget.
+
+    Parameters
+    ----------
+    dim: int
+        The dimension of the Hamiltonian, 3^N.
+    pt_freq: int
+        The number of experiments.
+    workers: int
+        The number of worker processes.
+    max_bytes: int
+        The memory budget of the results in flight.
+
+    Returns
+    -------
+    size: int
+        The number of experiments of each chunk, at least 1.
+    """
+
+    # The energies and the moves of one experiment:
+    per_point = 2 * dim * 8
+    even = -(-max(pt_freq - 1, 1) // workers)
+    return int(max(1, min(even, max_bytes // (2 * workers * per_point))))
+
+
+def parallel_levels(model, pt_freq, workers=None, max_bytes=256 * 2**20):
+    """
+        This function gives the ground state, 1st excited state and highest
+        energies of every experiment of a model, as print_result with the
+        'full' solver does, diagonalising the experiments on a process pool.
+
+    Parameters
+    ----------
+    model: InteractingModel
+        The model of the sweep.
+    pt_freq: int
+        This gives the number of experiments we want to conduct.
+    workers: int (Optional)
+        The number of worker processes. Default is the number of CPUs.
+    max_bytes: int (Optional)
+        The memory budget of the energies and overlap indices sent back by
+        the workers and not yet tracked, see chunk_size. It does not bound
+        the dense eigenvectors each worker holds. Default is 256 MiB.
+
+    Returns
+    -------
+    levels: numpy array
+        levels[0], levels[1] and levels[2] are the ground state, 1st excited
+        state and highest energies of each experiment.
+    x: numpy array
+        This corresponds to the ratio of interaction and confinement (v/t)
+        for each experiment.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    no_of_elec = model.no_of_elec
+    int_strength = get_array(model.inter_rng, pt_freq, model.int_incr)
+    conf_strength = get_array(model.wire_material.get_conf_rng(),
+                              pt_freq, model.conf_incr)
+
+    # The operator cache is written once, before the workers read it:
+    if model.operator_cache is not None:
+        model.unit_operators()
+
+    # The first experiment is not tracked, the second one follows the
+    # initial state and the later chunks the experiment before them:
+    state = model.state_vector(model.get_1st_excited())[:, None]
+    size = chunk_size(3 ** no_of_elec, pt_freq, workers, max_bytes)
+    chunks = [(0, 1)] + [(start, min(start + size, pt_freq)) for start in range(1, pt_freq, size)]
+
+    levels = np.zeros((3, pt_freq))
+    index = 0
+
+    def follow(start, future, index):
+        # The tracking follows the experiment order, while the later
+        # chunks are still diagonalised:
+        energies, moves = future.result()
+        for i in range(start, start + len(energies)):
+            levels[0, i], levels[2, i] = energies[i - start][0], energies[i - start][-1]
+            if i == 0:
+                levels[1, i] = 3 / 2 * no_of_elec * conf_strength[i]
+            else:
+                index = moves[i - start][index]
+                levels[1, i] = energies[i - start][index]
+        return index
+
+    # Chunks are submitted as the oldest ones are tracked, so that each
+    # worker has one chunk running and one waiting:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, stop in chunks:
+            previous = state if start <= 1 else (conf_strength[start - 1], int_strength[start - 1])
+            pending.append((start, pool.submit(
+                _track_chunk, no_of_elec, conf_strength[start:stop], int_strength[start:stop],
+                model.dtype, previous, model.operator_cache)))
+            if len(pending) == 2 * workers:
+                index = follow(*pending.popleft(), index)
+        while pending:
+            index = follow(*pending.popleft(), index)
+
+    return levels, int_strength / conf_strength
@@ -0,0 +1,171 @@
+from .checkpoint import sweep_key
+from .operator_cache import BASIS_VERSION
+import numpy as np
+import hashlib
+import tempfile
+import json
+import os
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and the standard library hashlib and json.
+
+    Description:
+    This file keeps the results of InteractingModel sweeps on disk, so a
+    sweep that was already run is loaded instead of computed again. Each
+    result is stored in a .npz file named after the hash of everything it
+    depends on: the material, the number of electrons, the ranges and
+    directions of the sweep, the number of experiments, the solver and the
+    basis version. The cache has a size cap; when it is exceeded, the least
+    recently used results are removed.
+'''
+
+RESULT_CACHE_VERSION = 1
+
+
+def result_key(model, pt_freq, solver='full', k=6):
+    """
+        This function gives the hash identifying the result of a sweep.
+
+    Parameters
+    ----------
+    model: InteractingModel
+        The model of the sweep.
+    pt_freq: int
+        This gives the number of experiments we want to conduct.
+    solver: str (Optional)
+        The solver of the sweep. Default is 'full'.
+    k: int (Optional)
+        The number of eigenpairs of the Lanczos solvers. Default is 6.
+
+    Returns
+    -------
+    key: str
+        The hexadecimal SHA-256 hash of the sweep.
+    """
+
+    description = json.loads(sweep_key(model, pt_freq, solver, k))
+    description.update({
+        'dielec_cons': float(model.wire_material.get_dielec_factor()),
+        'eff_mass_e': float(model.wire_material.get_eff_mass_factor()),
+        'basis_version': BASIS_VERSION, 'cache_version': RESULT_CACHE_VERSION})
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+        This is an on-disk cache of sweep results, one .npz file per result.
+
+    Parameters
+    ----------
+    directory: str
+        The directory of the cache. It is created if needed.
+    max_bytes: int (Optional)
+        The size cap of the cache. Default is 1 GiB.
+    """
+
+    def __init__(self, directory, max_bytes=2**30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        """
+            This method gives the file of a result.
+        """
+
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        """
+            This method loads a result, marking it as recently used.
+
+        Parameters
+        ----------
+        key: str
+            The output of result_key.
+
+        Returns
+        -------
+        result: numpy recarray or None
+            The result of the sweep, see InteractingModel.compute, or None
+            if it is not cached.
+        states: numpy array or None
+            The tracked 1st excited state of each experiment as rows, if
+            they were stored.
+        """
+
+        path = self.path(key)
+        try:
+            with np.load(path) as cached:
+                result = cached['result'].view(np.recarray)
+                states = cached['states'] if 'states' in cached.files else None
+        except (OSError, ValueError, KeyError):
+            return None, None
+        os.utime(path)
+        return result, states
+
+    def put(self, key, result, states=None):
+        """
+            This method stores a result and then removes the least recently
+            used results above the size cap.
+
+        Parameters
+        ----------
+        key: str
+            The output of result_key.
+        result: numpy recarray
+            The result of the sweep.
+        states: numpy array (Optional)
+            The tracked 1st excited state of each experiment as rows.
+
+        Returns
+        -------
+        None
+        """
+
+        arrays = {'result': np.asarray(result)}
+        if states is not None:
+            arrays['states'] = states
+
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp.npz')
+        with os.fdopen(handle, 'wb') as file:
+            np.savez(file, **arrays)
+        os.replace(temporary, self.path(key))
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """
+            This method removes the least recently used results until the
+            cache is within its size cap. The result keep is never removed.
+
+        Parameters
+        ----------
+        keep: str (Optional)
+            The key of a result to keep.
+
+        Returns
+        -------
+        None
+        """
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz') and not name.endswith('.tmp.npz'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, name[:-len('.npz')]))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+                total -= size
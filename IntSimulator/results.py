@@ -0,0 +1,85 @@
+from prettytable import PrettyTable
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and prettytable.
+
+    Description:
+    This file holds the results of an InteractingModel sweep as a numpy
+    record array, one record per experiment, so library callers get plain
+    columns without any printing. The table of print_result is rendered
+    from the same array.
+'''
+
+# (field, table heading)
+RESULT_FIELDS = [
+    ('V', 'V_int (meV)'),
+    ('t', 'V_conf (meV)'),
+    ('ratio', 'V_int/V_conf ()'),
+    ('separation', 'Electron Sep (nm)'),
+    ('width', 'Wire width (nm)'),
+    ('r_0', 'r_0 (nm)'),
+    ('e_g', 'e_g (meV)'),
+    ('e_1', 'e_1 (meV)'),
+    ('e_2', 'e_2 (meV)'),
+]
+
+RESULT_DTYPE = np.dtype([(field, np.float64) for field, _ in RESULT_FIELDS])
+
+
+def sweep_result(wire_material, v, t, levels):
+    """
+        This function collects the results of a sweep in a record array.
+        The length scales are computed for all experiments at once.
+
+    Parameters
+    ----------
+    wire_material: WireMaterial (class)
+        The material of the wire.
+    v: numpy array
+        The interaction strength of each experiment in units of meV.
+    t: numpy array
+        The confinement energy of each experiment in units of meV.
+    levels: numpy array
+        levels[0], levels[1] and levels[2] are the ground state, 1st excited
+        state and highest energies of each experiment.
+
+    Returns
+    -------
+    result: numpy recarray
+        One record per experiment, with the fields of RESULT_FIELDS. The
+        separation is nan without interaction.
+    """
+
+    v = np.asarray(v, dtype=float)
+    t = np.asarray(t, dtype=float)
+    result = np.zeros(len(v), dtype=RESULT_DTYPE).view(np.recarray)
+    result.V, result.t, result.ratio = v, t, v / t
+    result.width, result.r_0, result.separation = wire_material.length_scales(t, v)
+    result.e_g, result.e_1, result.e_2 = levels
+    return result
+
+
+def result_table(result):
+    """
+        This function renders the results of a sweep as a table.
+
+    Parameters
+    ----------
+    result: numpy recarray
+        The output of sweep_result.
+
+    Returns
+    -------
+    table: PrettyTable
+        One row per experiment.
+    """
+
+    table = PrettyTable()
+    table.field_names = [heading for _, heading in RESULT_FIELDS]
+    for record in result:
+        table.add_row(['No interaction' if field == 'separation' and np.isnan(record[field])
+                       else record[field] for field, _ in RESULT_FIELDS])
+    return table
@@ -0,0 +1,156 @@
+from qutip import Qobj
+from scipy import sparse
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use scipy.sparse to build the Hamiltonians as
+        CSR matrices. Qutip is only used to optionally wrap the result.
+
+    Description:
+    This file builds the same Hamiltonians as hamiltonians.py, but assembles
+    the N electron operators directly instead of tensoring one 3^N x 3^N
+    operator per site. The confinement is the Kronecker sum of the single
+    site Hamiltonian and the interaction is diagonal, so it is stored as a
+    single 3^N vector.
+'''
+
+# The single site Hamiltonian with t = 1, see hamiltonian_site_i:
+SITE_UNIT = np.array([[3/2, -np.sqrt(2)/2, 0],
+                      [-np.sqrt(2)/2, 3/2, -np.sqrt(2)/2],
+                      [0, -np.sqrt(2)/2, 3/2]])
+
+# The diagonal of the 2 electron interaction with V = 1, see
+# hamiltonian_int_i. Entry 3a + b is the interaction of neighbouring
+# electrons in the site states a and b:
+INT_UNIT = np.array([1, 1/np.sqrt(2), 1/np.sqrt(5),
+                     1/np.sqrt(2), 1, 1/np.sqrt(2),
+                     1/np.sqrt(5), 1/np.sqrt(2), 1])
+
+
+def site_operator(no_of_elec, dtype=np.float64):
+    """
+        This function gives the total confinement Hamiltonian with t = 1 as
+        the Kronecker sum of the single site Hamiltonian, built recursively:
+        K_1 = h, K_N = K_(N-1) x I_3 + I_(3^(N-1)) x h.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    dtype: data-type (Optional)
+        The data type of the matrix. Default is float64.
+
+    Returns
+    -------
+    H_site: scipy.sparse.csr_matrix
+        This returns the 3^N x 3^N unit confinement Hamiltonian.
+    """
+
+    h = sparse.csr_matrix(SITE_UNIT.astype(dtype))
+    H_site = h
+    for i in range(1, no_of_elec):
+        H_site = sparse.kron(H_site, sparse.identity(3, dtype=dtype), format='csr') + \
+            sparse.kron(sparse.identity(3 ** i, dtype=dtype), h, format='csr')
+    return H_site.tocsr()
+
+
+def interaction_diagonal(no_of_elec, dtype=np.float64):
+    """
+        This function gives the diagonal of the total interaction Hamiltonian
+        with V = 1, summed over all neighbouring pairs of electrons.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    dtype: data-type (Optional)
+        The data type of the vector. Default is float64.
+
+    Returns
+    -------
+    diagonal: numpy array
+        This returns the 3^N diagonal of the unit interaction Hamiltonian.
+    """
+
+    # The diagonal is built one site at a time. Appending a site in state b
+    # to a chain whose last site is in state a adds the pair term of (a, b),
+    # and the state of the last site is the last base 3 digit of the index:
+    pair = INT_UNIT.astype(dtype).reshape(3, 3)
+    diagonal = np.zeros(3, dtype=dtype)
+    for _ in range(no_of_elec - 1):
+        diagonal = (diagonal.reshape(-1, 3, 1) + pair).ravel()
+    return diagonal
+
+
+def sparse_total_hamiltonian(no_of_elec, t, V, qobj=False, dtype=np.float64):
+    """
+        This function gives total Hamiltonian of a N particle system where
+        both interaction and confinement is included, as a single CSR matrix.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    t: float
+        The confinement energy. It is in units of meV.
+    V: float
+        The interaction strength between electrons in units of meV.
+    qobj: bool (Optional)
+        Whether to wrap the matrix in a Qobj. Default is False.
+    dtype: data-type (Optional)
+        The data type of the matrix. Default is float64.
+
+    Returns
+    -------
+    H: scipy.sparse.csr_matrix or Qobj
+        This returns a 3^N x 3^N matrix representing the total Hamiltonian.
+    """
+
+    H = float(t) * site_operator(no_of_elec, dtype) + \
+        sparse.diags(float(V) * interaction_diagonal(no_of_elec, dtype), format='csr')
+    if qobj is True:
+        return Qobj(H)
+    return H.tocsr()
+
+
+def extend_operators(H_site, H_int, dtype=np.float64):
+    """
+        This function gives the unit operators of N + 1 electrons from those
+        of N electrons, adding one site to the end of the chain:
+        K_(N+1) = K_N x I_3 + I_(3^N) x h, and the interaction diagonal gains
+        the pair of the last two sites.
+
+    Parameters
+    ----------
+    H_site: scipy.sparse.csr_matrix or None
+        The unit confinement Hamiltonian of N electrons, see site_operator,
+        or None for no electrons.
+    H_int: numpy array or None
+        The unit interaction diagonal of N electrons, see
+        interaction_diagonal, or None for no electrons.
+    dtype: data-type (Optional)
+        The data type of the operators. Default is float64.
+
+    Returns
+    -------
+    H_site: scipy.sparse.csr_matrix
+        The unit confinement Hamiltonian of N + 1 electrons.
+    H_int: numpy array
+        The unit interaction diagonal of N + 1 electrons.
+    """
+
+    h = sparse.csr_matrix(SITE_UNIT.astype(dtype))
+    if H_site is None:
+        return h, np.zeros(3, dtype=dtype)
+
+    dim = H_site.shape[0]
+    H_site = sparse.kron(H_site, sparse.identity(3, dtype=dtype), format='csr') + \
+        sparse.kron(sparse.identity(dim, dtype=dtype), h, format='csr')
+
+    # The state of the old last site is the last base 3 digit of the old index:
+    last = np.arange(dim) % 3
+    pair = INT_UNIT.astype(dtype)[3 * last[:, None] + np.arange(3)]
+    H_int = (np.repeat(H_int, 3).reshape(dim, 3) + pair).ravel()
+    return H_site.tocsr(), H_int
@@ -0,0 +1,294 @@
+from functools import lru_cache
+from scipy import sparse
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and scipy.sparse.
+
+    Description:
+    This file block diagonalises the N electron Hamiltonian with its two
+    symmetries:
+        - reflection of the electron chain, i.e. reversing the site order,
+        - parity, flipping the basis states 0 <-> 2 of every site at once.
+    The single site Hamiltonian is invariant under the flip of one site,
+    but the interaction only depends on |a - b| of neighbouring site states,
+    so only the simultaneous flip of all sites is a symmetry. Both are
+    permutations of the 3^N basis states and commute, which gives 4 sectors
+    labelled (reflection, parity) with eigenvalues +1 or -1.
+'''
+
+SECTORS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def symmetry_images(no_of_elec):
+    """
+        This function gives the image of every basis state under the
+        symmetry operations.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+
+    Returns
+    -------
+    images: dict
+        'reflection', 'parity' and 'both' map to integer arrays, where
+        images[g][i] is the index of the basis state g|i>.
+    """
+
+    shape = (3,) * no_of_elec
+    states = np.indices(shape).reshape(no_of_elec, -1)
+    reflection = np.ravel_multi_index(states[::-1], shape)
+    parity = np.ravel_multi_index(2 - states, shape)
+    return {'reflection': reflection, 'parity': parity, 'both': parity[reflection]}
+
+
+@lru_cache(maxsize=32)
+def sector_basis(no_of_elec, reflection, parity):
+    """
+        This function gives an orthonormal basis of a symmetry sector. Each
+        basis vector is the symmetrised sum over the orbit of one basis state.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    reflection: int
+        The reflection eigenvalue of the sector, +1 or -1.
+    parity: int
+        The parity eigenvalue of the sector, +1 or -1.
+
+    Returns
+    -------
+    Q: scipy.sparse.csc_matrix
+        A 3^N x d isometry whose columns span the sector. It is cached,
+        so it must not be modified.
+    """
+
+    images = symmetry_images(no_of_elec)
+    index = np.arange(3 ** no_of_elec)
+    orbit = np.stack([index, images['reflection'], images['parity'], images['both']])
+    reps = np.unique(orbit.min(axis=0))
+
+    characters = np.array([1, reflection, parity, reflection * parity], dtype=float)
+    rows = orbit[:, reps].ravel()
+    cols = np.tile(np.arange(len(reps)), 4)
+    data = np.repeat(characters, len(reps))
+    Q = sparse.coo_matrix((data, (rows, cols)), shape=(len(index), len(reps))).tocsc()
+    Q.sum_duplicates()
+
+    norms = np.sqrt(np.asarray(Q.multiply(Q).sum(axis=0)).ravel())
+    keep = norms > 1e-12
+    return (Q[:, keep] @ sparse.diags(1 / norms[keep])).tocsc()
+
+
+def projector(no_of_elec, reflection, parity):
+    """
+        This function gives the projector onto a symmetry sector.
+
+    Parameters
+    ----------
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    reflection, parity: int
+        The eigenvalues of the sector, +1 or -1.
+
+    Returns
+    -------
+    P: scipy.sparse.csr_matrix
+        The 3^N x 3^N projector.
+    """
+
+    Q = sector_basis(no_of_elec, reflection, parity)
+    return (Q @ Q.T).tocsr()
+
+
+def sector_of(state, no_of_elec):
+    """
+        This function finds the symmetry sector with the largest weight of
+        a state.
+
+    Parameters
+    ----------
+    state: numpy array
+        The 3^N state.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+
+    Returns
+    -------
+    sector: tuple (int, int)
+        The (reflection, parity) label.
+    """
+
+    weights = [np.linalg.norm(sector_basis(no_of_elec, *sector).T @ state)
+               for sector in SECTORS]
+    return SECTORS[int(np.argmax(weights))]
+
+
+def enclosing_sector(state, no_of_elec, tol=1e-8):
+    """
+        This function gives the basis of the symmetry sector holding a
+        state, if the state lies in a single sector.
+
+    Parameters
+    ----------
+    state: numpy array
+        The 3^N state.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    tol: float (Optional)
+        The largest relative weight of the state outside the sector.
+        Default is 1e-8.
+
+    Returns
+    -------
+    Q: scipy.sparse.csc_matrix or None
+        The basis of the sector, see sector_basis, or None if the state is
+        spread over several sectors.
+    """
+
+    state = np.ravel(state)
+    Q = sector_basis(no_of_elec, *sector_of(state, no_of_elec))
+    inside = np.linalg.norm(Q.T @ state) ** 2
+    if inside < (1 - tol) * np.vdot(state, state).real:
+        return None
+    return Q
+
+
+def sector_eigenpairs(H, no_of_elec, vectors=True):
+    """
+        This function diagonalises the Hamiltonian in each symmetry sector,
+        keeping the eigenvectors in the sector bases. Only the blocks are
+        stored, which needs about 1/4 of the memory of the full eigenvectors.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix
+        The 3^N x 3^N Hamiltonian.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    vectors: bool (Optional)
+        Whether to find the eigenvectors. Default is True.
+
+    Returns
+    -------
+    blocks: dict
+        Maps each non-empty (reflection, parity) sector to (energies,
+        vectors, Q), where energies are increasing, vectors[:, i] is the ith
+        eigenvector in the sector basis, or None, and Q @ vectors lifts them
+        to the full 3^N basis.
+    """
+
+    blocks = {}
+    for sector in SECTORS:
+        Q = sector_basis(no_of_elec, *sector).astype(H.dtype, copy=False)
+        if Q.shape[1] == 0:
+            continue
+        block = Q.T @ H @ Q
+        block = block.toarray() if sparse.issparse(block) else np.asarray(block)
+        if vectors:
+            blocks[sector] = np.linalg.eigh(block) + (Q,)
+        else:
+            blocks[sector] = (np.linalg.eigvalsh(block), None, Q)
+    return blocks
+
+
+def block_eigenpairs(H, no_of_elec):
+    """
+        This function diagonalises the Hamiltonian sector by sector.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix
+        The 3^N x 3^N Hamiltonian.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+
+    Returns
+    -------
+    energies: numpy array
+        All the eigenenergies in increasing order.
+    vectors: numpy array
+        The eigenvectors in the full 3^N basis, vectors[:, i] belongs to
+        energies[i].
+    sectors: numpy array
+        sectors[i] is the (reflection, parity) label of the ith state.
+    """
+
+    energies, vectors, sectors = [], [], []
+    for sector, (block_energies, block_vectors, Q) in sector_eigenpairs(H, no_of_elec).items():
+        energies.append(block_energies)
+        vectors.append(Q @ block_vectors)
+        sectors.append(np.tile(sector, (len(block_energies), 1)))
+
+    energies = np.concatenate(energies)
+    order = np.argsort(energies, kind='stable')
+    return energies[order], np.concatenate(vectors, axis=1)[:, order], \
+        np.concatenate(sectors)[order]
+
+
+def sector_candidates(H, no_of_elec, state, blocks=None):
+    """
+        This function gives the eigenstates that may be tracked from one or
+        more states: those in the sectors of the states, excluding the
+        ground state and the highest state of the whole spectrum. The other
+        sectors have no overlap with the states, so their eigenvectors are
+        never lifted to the full basis.
+
+    Parameters
+    ----------
+    H: scipy sparse matrix
+        The 3^N x 3^N Hamiltonian.
+    no_of_elec: int
+        This is the number of electrons in the whole system.
+    state: numpy array or None
+        The tracked 3^N state, or several states as columns. If None, there
+        are no candidates.
+    blocks: dict (Optional)
+        The output of sector_eigenpairs for H, if already computed. H is
+        then not used.
+
+    Returns
+    -------
+    e_g: float
+        The ground state energy.
+    top: float
+        The largest eigenenergy.
+    energies: numpy array
+        The energies of the candidate states.
+    vectors: numpy array
+        The candidate states in the full 3^N basis, as columns.
+    """
+
+    if blocks is None:
+        blocks = sector_eigenpairs(H, no_of_elec)
+    ground_sector = min(blocks, key=lambda sector: blocks[sector][0][0])
+    top_sector = max(blocks, key=lambda sector: blocks[sector][0][-1])
+    e_g = blocks[ground_sector][0][0]
+    top = blocks[top_sector][0][-1]
+
+    if state is None:
+        return e_g, top, np.zeros(0), np.zeros((3 ** no_of_elec, 0))
+    states = np.asarray(state).reshape(3 ** no_of_elec, -1)
+    sectors = {sector_of(states[:, i], no_of_elec) for i in range(states.shape[1])}
+
+    energies, vectors = [], []
+    for sector in SECTORS:
+        if sector not in sectors:
+            continue
+        block_energies, block_vectors, Q = blocks[sector]
+        keep = np.ones(len(block_energies), dtype=bool)
+        if sector == ground_sector:
+            keep[0] = False
+        if sector == top_sector:
+            keep[-1] = False
+        energies.append(block_energies[keep])
+        vectors.append(Q @ block_vectors[:, keep])
+
+    energies = np.concatenate(energies)
+    order = np.argsort(energies, kind='stable')
+    return e_g, top, energies[order], np.concatenate(vectors, axis=1)[:, order]
@@ -1,4 +1,7 @@
-from IntSimulator.hamiltonians import hamiltonian_site_i, total_hamiltonian_site, total_hamiltonian_int
+from IntSimulator.hamiltonians import hamiltonian_site_i, total_hamiltonian_site, total_hamiltonian_int, total_hamiltonian, \
+    hamiltonian_int, hamiltonian_int_i
+from IntSimulator.sparse_hamiltonians import sparse_total_hamiltonian
+from IntSimulator.operators import hamiltonian_operator
 from qutip import Qobj
 import pytest
 import numpy as np
@@ -28,3 +31,41 @@ def test_single_site_evectors():
     assert (evector_2[0] == pytest.approx(-0.5))
     assert (evector_2[1] == pytest.approx(np.sqrt(2)/2))
     assert (evector_2[2] == pytest.approx(-0.5))
+
+def test_total_interaction_sums_pairs():
+    hamiltonian = total_hamiltonian_int(3, 1)
+
+    # All 3 electrons in the same site state: both pairs give V.
+    assert (hamiltonian.full()[0, 0] == pytest.approx(2))
+    assert (hamiltonian.full()[1, 1] == pytest.approx(1 + 1/np.sqrt(2)))
+
+def test_total_interaction_regression():
+    # Every neighbouring pair adds V * pair[3a + b], where a and b are the
+    # site states of the pair, i.e. neighbouring base 3 digits of the index.
+    pair = np.diag(hamiltonian_int_i(0.7).full()).real
+    for no_of_elec in range(2, 6):
+        digits = np.array(np.unravel_index(np.arange(3 ** no_of_elec), (3,) * no_of_elec))
+        expected = pair[3 * digits[:-1] + digits[1:]].sum(axis=0)
+        hamiltonian = total_hamiltonian_int(no_of_elec, 0.7).full()
+
+        assert (np.allclose(hamiltonian, np.diag(expected)))
+        if no_of_elec > 2:
+            assert (not np.allclose(hamiltonian, hamiltonian_int(no_of_elec, no_of_elec - 2, 0.7).full()))
+
+def test_sparse_total_hamiltonian():
+    for no_of_elec in range(1, 5):
+        expected = total_hamiltonian(no_of_elec, 1.3, 0.7).full()
+        hamiltonian = sparse_total_hamiltonian(no_of_elec, 1.3, 0.7)
+
+        assert (hamiltonian.format == 'csr')
+        assert (np.allclose(hamiltonian.toarray(), expected))
+        assert (np.allclose(sparse_total_hamiltonian(no_of_elec, 1.3, 0.7, qobj=True).full(), expected))
+
+def test_hamiltonian_operator():
+    for no_of_elec in range(1, 5):
+        expected = sparse_total_hamiltonian(no_of_elec, 1.3, 0.7)
+        operator = hamiltonian_operator(no_of_elec, 1.3, 0.7)
+        states = np.random.default_rng(no_of_elec).random((3 ** no_of_elec, 3))
+
+        assert (np.allclose(operator @ states, expected @ states))
+        assert (np.allclose(operator @ states[:, 0], expected @ states[:, 0]))
@@ -0,0 +1,265 @@
+from IntSimulator.model import WireMaterial, InteractingModel
+from IntSimulator.sparse_hamiltonians import sparse_total_hamiltonian
+from IntSimulator.eigensolvers import full_eigenpairs, lowest_eigenpairs
+import pytest
+import numpy as np
+
+material = WireMaterial(12.4, (1, 1), 0.067, 'GaAs')
+
+def test_lowest_eigenpairs():
+    hamiltonian = sparse_total_hamiltonian(5, 1, 0.8)
+    energies, vectors, top = full_eigenpairs(hamiltonian)
+    low_energies, low_vectors, low_top = lowest_eigenpairs(hamiltonian, 4)
+
+    assert (low_energies == pytest.approx(energies[:4]))
+    assert (low_top == pytest.approx(top))
+    assert (np.abs(np.sum(low_vectors * vectors[:, :4], axis=0)) == pytest.approx(np.ones(4)))
+
+def test_sparse_solver_matches_full():
+    full, x = InteractingModel(material, 3, (0, 2)).print_result(10, True)
+    sparse, x_sparse = InteractingModel(material, 3, (0, 2)).print_result(10, True, solver='sparse', k=4)
+
+    assert (x_sparse == pytest.approx(x))
+    for energy, sparse_energy in zip(full, sparse):
+        assert (sparse_energy == pytest.approx(energy))
+
+    full, x = InteractingModel(material, 5, (0, 2)).print_result(5, True)
+    sparse, x = InteractingModel(material, 5, (0, 2)).print_result(5, True, solver='sparse')
+    for energy, sparse_energy in zip(full, sparse):
+        assert (sparse_energy == pytest.approx(energy))
+
+    # The tracked level is spread over many states near the start of the
+    # sweep, so the window must widen to hold its largest overlap:
+    full = InteractingModel(material, 6, (0, 2)).compute(6)
+    sparse = InteractingModel(material, 6, (0, 2)).compute(6, solver='sparse')
+    for field in ('e_g', 'e_1', 'e_2'):
+        assert (sparse[field] == pytest.approx(full[field]))
+
+def test_assign_levels_is_global():
+    from IntSimulator.tracking import assign_levels
+
+    # Greedy choice would give both states level 0:
+    overlaps = np.array([[0.9, 0.8, 0.1],
+                         [0.85, 0.2, 0.1]])
+    assert (list(assign_levels(overlaps)) == [1, 0])
+    assert (list(assign_levels(overlaps[:1])) == [0])
+
+def test_track_levels_matches_print_result():
+    model = InteractingModel(material, 4, (0, 2))
+    energies, x = model.print_result(8)
+    tracked, x_tracked = model.track_levels(8)
+
+    assert (x_tracked == pytest.approx(x))
+    assert (tracked[0][1:] == pytest.approx(energies[1][1:]))
+
+    levels, x = model.track_levels(8, [model.get_1st_excited(), np.eye(81)[:, 40]], solver='symmetry')
+    assert (levels.shape == (2, 8))
+    assert (levels[0] == pytest.approx(tracked[0]))
+
+def test_track_several_levels_with_lanczos_solvers():
+    model = InteractingModel(material, 5, (0.5, 2))
+    states = [model.get_1st_excited(), np.eye(243)[:, 121]]
+    full, x = model.track_levels(6, states)
+
+    for solver in ('sparse', 'warm'):
+        levels, x = InteractingModel(material, 5, (0.5, 2)).track_levels(6, states, solver=solver)
+        assert (levels.shape == (2, 6))
+        assert (levels == pytest.approx(full))
+
+def test_warm_solver_matches_sparse():
+    model = InteractingModel(material, 6, (0.5, 0.7))
+    warm, x = model.print_result(6, True, solver='warm')
+    sparse, x = InteractingModel(material, 6, (0.5, 0.7)).print_result(6, True, solver='sparse')
+
+    for energy, warm_energy in zip(sparse, warm):
+        assert (warm_energy == pytest.approx(energy))
+    assert (len(model.iterations) == 6)
+    assert (model.iterations[-1]['lowest'] < model.iterations[0]['lowest'])
+
+    # The window around the tracked state is counted too, except at the
+    # first experiment, where it is not tracked:
+    assert (model.iterations[0]['nearest'] == 0)
+    assert (all(count['nearest'] > 0 and count['factorised'] > 0 for count in model.iterations[1:]))
+
+def test_print_result_closes_banner(capsys):
+    InteractingModel(material, 3, (0, 2)).print_result(3)
+    banner, table = capsys.readouterr().out.split('\n\n\n')
+    assert (banner.splitlines()[-1] == '#' * 58)
+
+def test_spectrum_cache_reuses_equal_ratios():
+    scaled = WireMaterial(12.4, (1, 2), 0.067, 'GaAs')
+    model = InteractingModel(scaled, 4, (1, 2))
+    energies, x = model.print_result(6, True)
+
+    # The first experiment only needs the eigenvalues, so the second one
+    # diagonalises again for the eigenvectors:
+    assert (model.spectrum_cache_hits == 4)
+    assert (len(model._spectra) == 1)
+
+    model.spectrum_cache_bytes = 0
+    model._spectra.clear()
+    uncached, x = model.print_result(6, True)
+    for energy, uncached_energy in zip(energies, uncached):
+        assert (uncached_energy == pytest.approx(energy))
+    assert (len(model._spectra) == 0)
+
+def test_spectrum_cache_is_capped_in_bytes():
+    model = InteractingModel(material, 4, (0, 2))
+    model.spectrum_cache_bytes = 3 * (81 * 81 + 81) * 8
+    model.compute(8)
+    assert (len(model._spectra) == 3)
+    assert (all(vectors is not None for _, vectors, _ in model._spectra.values()))
+
+    model.compute(8, solver='symmetry')
+    assert (sum(model._spectrum_bytes(spectrum)[0] for spectrum in model._spectra.values())
+            <= model.spectrum_cache_bytes)
+
+def test_matrix_free_solver_tracks_low_levels():
+    # The 1st excited state lies above the k lowest eigenpairs:
+    with pytest.raises(ValueError):
+        InteractingModel(material, 4, (0.5, 2)).print_result(5, True, solver='matrix_free')
+    with pytest.raises(ValueError):
+        InteractingModel(material, 4, (0.5, 2)).track_levels(5, solver='matrix_free', k=4)
+
+    # A low lying level is among the k lowest eigenpairs:
+    model = InteractingModel(material, 4, (0.5, 2))
+    start = full_eigenpairs(model.hamiltonian(1, 1.7))[1][:, 1]
+    full, x = model.track_levels(5, [start])
+    levels, x = InteractingModel(material, 4, (0.5, 2)).track_levels(5, [start], solver='matrix_free')
+    assert (levels == pytest.approx(full))
+
+def test_float32_model_matches_float64():
+    model = InteractingModel(material, 4, (0.5, 2), dtype=np.float32)
+    assert (model.state_vector(model.get_1st_excited()).dtype == np.float32)
+    assert (model.hamiltonian(1, 1).dtype == np.float32)
+
+    single, x = model.print_result(5, True)
+    double, x = InteractingModel(material, 4, (0.5, 2)).print_result(5, True)
+    for energy, single_energy in zip(double, single):
+        assert (single_energy == pytest.approx(energy, rel=1e-5))
+
+def test_parallel_sweep_matches_serial():
+    from IntSimulator.parallel import parallel_levels
+
+    serial, x = InteractingModel(material, 4, (0, 2)).print_result(6, True)
+    parallel, x_parallel = InteractingModel(material, 4, (0, 2)).print_result(6, True, workers=2)
+    for energy, parallel_energy in zip(serial, parallel):
+        assert (parallel_energy == pytest.approx(energy))
+
+    # Chunks of a single experiment:
+    levels, x_levels = parallel_levels(InteractingModel(material, 4, (0, 2)), 6, 2, max_bytes=1)
+    assert (levels == pytest.approx(np.array(serial)))
+    assert (x_levels == pytest.approx(x))
+
+    # Several chunks per worker, each following the one before:
+    serial, x = InteractingModel(material, 5, (0.5, 2)).print_result(9, True)
+    parallel, x = InteractingModel(material, 5, (0.5, 2)).print_result(9, True, workers=2,
+                                                                      max_bytes=3 * 2 * 2 * (2 * 243 * 8))
+    for energy, parallel_energy in zip(serial, parallel):
+        assert (parallel_energy == pytest.approx(energy))
+
+def test_chunk_size_keeps_every_worker_busy():
+    from IntSimulator.parallel import chunk_size
+
+    # The chunks do not hold eigenvectors, so N = 8 still runs on 8 workers:
+    assert (chunk_size(3 ** 8, 65, 8, 256 * 2**20) == 8)
+    assert (chunk_size(3 ** 8, 65, 8, 1) == 1)
+    assert (chunk_size(81, 1, 4, 256 * 2**20) == 1)
+
+def test_compute_is_quiet_and_matches_print_result(capsys):
+    result = InteractingModel(material, 3, (0, 2)).compute(5)
+    assert (capsys.readouterr().out == '')
+    assert (result.dtype.names == ('V', 't', 'ratio', 'separation', 'width', 'r_0', 'e_g', 'e_1', 'e_2'))
+
+    energies, x = InteractingModel(material, 3, (0, 2)).print_result(5, True)
+    assert (result.ratio == pytest.approx(x))
+    assert (result.e_1 == pytest.approx(energies[1]))
+    assert (result.e_2 == pytest.approx(energies[2]))
+    assert (np.isnan(result.separation[result.V == 0]).all())
+
+    width, r_0, separation = material.length_scales(result.t[:1], result.V[:1])
+    assert (result.width[0] == pytest.approx(width[0]))
+    assert (result.r_0[0] == pytest.approx(r_0[0]))
+
+def test_checkpoint_resume_matches_uninterrupted(tmp_path):
+    checkpoint = str(tmp_path / 'sweep.npz')
+    expected = InteractingModel(material, 4, (0, 2)).compute(7)
+
+    # Stop the sweep at the 6th experiment, after the checkpoint of the 4th:
+    model = InteractingModel(material, 4, (0, 2))
+    tracking_candidates = model.tracking_candidates
+    calls = []
+
+    def stopping(*args):
+        calls.append(1)
+        if len(calls) == 6:
+            raise KeyboardInterrupt
+        return tracking_candidates(*args)
+
+    model.tracking_candidates = stopping
+    with pytest.raises(KeyboardInterrupt):
+        model.compute(7, checkpoint=checkpoint, checkpoint_every=2)
+
+    resumed_model = InteractingModel(material, 4, (0, 2))
+    resumed_model.tracking_candidates = lambda *args: calls.append(1) or tracking_candidates(*args)
+    resumed = resumed_model.resume(checkpoint)
+    assert (len(calls) == 6 + 3)
+    for field in ('e_g', 'e_1', 'e_2', 'ratio'):
+        assert (resumed[field] == pytest.approx(expected[field]))
+
+    with pytest.raises(ValueError):
+        InteractingModel(material, 3, (0, 2)).compute(7, checkpoint=checkpoint)
+
+def test_warm_report_of_resumed_sweep(tmp_path, capsys):
+    checkpoint = str(tmp_path / 'warm.npz')
+    model = InteractingModel(material, 3, (0, 2))
+    tracking_candidates = model.tracking_candidates
+
+    def stopping(*args):
+        if len(model.iterations) == 3:
+            raise KeyboardInterrupt
+        return tracking_candidates(*args)
+
+    # Stopped after the checkpoint of the 2nd experiment:
+    model.tracking_candidates = stopping
+    with pytest.raises(KeyboardInterrupt):
+        model.compute(6, solver='warm', k=4, checkpoint=checkpoint, checkpoint_every=2)
+
+    resumed = InteractingModel(material, 3, (0, 2))
+    resumed.print_result(6, solver='warm', checkpoint=checkpoint, k=4)
+    assert (len(resumed.iterations) == 4)
+    assert ('resumed at index 2' in capsys.readouterr().out)
+
+    # A finished checkpoint solves nothing:
+    resumed.print_result(6, solver='warm', checkpoint=checkpoint, k=4)
+    assert (resumed.iterations == [])
+    assert ('the sweep was loaded' in capsys.readouterr().out)
+
+def test_adaptive_sweep_within_budget_matches_uniform():
+    from IntSimulator.adaptive import adaptive_sweep
+
+    uniform = InteractingModel(material, 4, (0, 2)).compute(65)
+    adaptive = adaptive_sweep(InteractingModel(material, 4, (0, 2)), 65, budget=12)
+    assert (len(adaptive) <= 12)
+    assert (adaptive.ratio[:2] == pytest.approx(uniform.ratio[:2]))
+    assert (adaptive.e_1[:2] == pytest.approx(uniform.e_1[:2]))
+
+    # The first experiment is not tracked, the rest is resolved:
+    order = np.argsort(adaptive.ratio[1:]) + 1
+    resampled = np.interp(uniform.ratio[1:], adaptive.ratio[order], adaptive.e_1[order])
+    assert (resampled == pytest.approx(uniform.e_1[1:], abs=1e-2))
+
+def test_adaptive_sweep_keeps_few_candidates():
+    from IntSimulator.adaptive import adaptive_sweep, keep_candidates
+
+    model = InteractingModel(material, 4, (0, 2))
+    state = model.state_vector(model.get_1st_excited())
+    spectrum = model.tracking_candidates(1, 1.5, state)
+    e_g, e_2, energies, vectors, columns, source = keep_candidates(spectrum, state, 0.05)
+    assert (len(energies) == 79 and vectors.shape[1] < 79)
+    assert (vectors == pytest.approx(spectrum[3][:, columns]))
+    assert (np.linalg.norm(vectors.T @ state) ** 2 >= np.linalg.norm(spectrum[3].T @ state) ** 2 - 0.05 ** 2)
+
+    for pt_freq, budget in ((2, 12), (65, 2)):
+        with pytest.raises(ValueError):
+            adaptive_sweep(InteractingModel(material, 4, (0, 2)), pt_freq, budget)
@@ -0,0 +1,26 @@
+from IntSimulator.multi_sweep import multi_sweep, scaling_table
+from IntSimulator.sparse_hamiltonians import extend_operators, site_operator, interaction_diagonal
+from IntSimulator.model import InteractingModel, WireMaterial
+import pytest
+import numpy as np
+
+material = WireMaterial(12.4, (1, 1), 0.067, 'GaAs')
+
+def test_extend_operators_matches_direct_construction():
+    H_site, H_int = None, None
+    for no_of_elec in range(1, 6):
+        H_site, H_int = extend_operators(H_site, H_int)
+        assert (abs(H_site - site_operator(no_of_elec)).max() == pytest.approx(0))
+        assert (H_int == pytest.approx(interaction_diagonal(no_of_elec)))
+
+def test_multi_sweep_matches_separate_sweeps():
+    results, report = multi_sweep(material, [4, 2, 3], (0, 2), 5)
+    assert (list(report.N) == [2, 3, 4])
+    assert (list(report.dimension) == [9, 27, 81])
+    assert (np.all(report.build_time >= 0) and np.all(report.sweep_time >= 0))
+    assert (len(scaling_table(report).rows) == 3)
+
+    for no_of_elec in (2, 3, 4):
+        expected = InteractingModel(material, no_of_elec, (0, 2)).compute(5)
+        for field in expected.dtype.names:
+            assert (np.allclose(results[no_of_elec][field], expected[field], equal_nan=True))
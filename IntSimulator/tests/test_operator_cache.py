@@ -0,0 +1,32 @@
+from IntSimulator.operator_cache import load_operators, operator_cache_path, first_excited_state
+from IntSimulator.sparse_hamiltonians import site_operator, interaction_diagonal
+from IntSimulator.model import InteractingModel, WireMaterial
+import pytest
+import numpy as np
+import os
+
+def test_load_operators_builds_and_reuses(tmp_path):
+    H_site, H_int, first_excited = load_operators(str(tmp_path), 3)
+    path = operator_cache_path(str(tmp_path), 3)
+    assert (os.listdir(str(tmp_path)) == [os.path.basename(path)])
+    assert (isinstance(H_int, np.memmap))
+
+    assert (np.allclose(H_site.toarray(), site_operator(3).toarray()))
+    assert (np.allclose(H_int, interaction_diagonal(3)))
+    assert (np.linalg.norm(first_excited) == pytest.approx(1))
+
+    modified = os.stat(os.path.join(path, 'interaction.npy')).st_mtime_ns
+    load_operators(str(tmp_path), 3)
+    assert (os.stat(os.path.join(path, 'interaction.npy')).st_mtime_ns == modified)
+
+def test_cached_model_matches(tmp_path):
+    material = WireMaterial(12.4, (1, 1), 0.067, 'GaAs')
+    model = InteractingModel(material, 3, (0, 2), operator_cache=str(tmp_path))
+    assert (np.allclose(model.get_1st_excited().full(),
+                        InteractingModel(material, 3, (0, 2)).get_1st_excited().full()))
+    assert (first_excited_state(3) == pytest.approx(model.state_vector(model.get_1st_excited())))
+
+    cached, x = model.print_result(5, True)
+    expected, x = InteractingModel(material, 3, (0, 2)).print_result(5, True)
+    for energy, cached_energy in zip(expected, cached):
+        assert (cached_energy == pytest.approx(energy))
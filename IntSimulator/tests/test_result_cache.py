@@ -0,0 +1,56 @@
+from IntSimulator.result_cache import ResultCache, result_key
+from IntSimulator.model import InteractingModel, WireMaterial
+import pytest
+import numpy as np
+import os
+
+material = WireMaterial(12.4, (1, 1), 0.067, 'GaAs')
+
+def test_result_key_depends_on_inputs():
+    model = InteractingModel(material, 3, (0, 2))
+    assert (result_key(model, 5) == result_key(InteractingModel(material, 3, (0, 2)), 5))
+    assert (result_key(model, 5) != result_key(model, 6))
+    assert (result_key(model, 5) != result_key(InteractingModel(material, 3, (0, 2), False), 5))
+    assert (result_key(model, 5) != result_key(
+        InteractingModel(WireMaterial(13, (1, 1), 0.067), 3, (0, 2)), 5))
+
+def test_cached_sweep_is_not_recomputed(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    model = InteractingModel(material, 3, (0, 2))
+    result = model.compute(5, cache=cache)
+    assert (model.tracked_states.shape == (5, 27))
+
+    cached_model = InteractingModel(material, 3, (0, 2))
+    cached_model.tracking_candidates = None
+    cached = cached_model.compute(5, cache=cache)
+    for field in result.dtype.names:
+        assert (np.allclose(cached[field], result[field], equal_nan=True))
+    assert (cached_model.tracked_states == pytest.approx(model.tracked_states))
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    model = InteractingModel(material, 3, (0, 2))
+    for pt_freq in (3, 4, 5):
+        model.compute(pt_freq, cache=cache)
+        os.utime(cache.path(result_key(model, pt_freq)), (pt_freq, pt_freq))
+    sizes = sorted(os.path.getsize(os.path.join(str(tmp_path), name)) for name in os.listdir(str(tmp_path)))
+
+    # Using the oldest result makes the 4 point sweep the least recently used:
+    cache.get(result_key(model, 3))
+    cache.max_bytes = sizes[-1] + sizes[-2]
+    cache.evict()
+    assert (cache.get(result_key(model, 3))[0] is not None)
+    assert (cache.get(result_key(model, 4))[0] is None)
+    assert (cache.get(result_key(model, 5))[0] is not None)
+
+def test_cached_warm_sweep_is_reported(tmp_path, capsys):
+    cache = ResultCache(str(tmp_path))
+    model = InteractingModel(material, 3, (0, 2))
+    energies, x = model.print_result(4, True, solver='warm', cache=cache)
+    assert (len(model.iterations) == 4)
+
+    cached, x = model.print_result(4, True, solver='warm', cache=cache)
+    assert (model.iterations == [])
+    assert ('the sweep was loaded' in capsys.readouterr().out)
+    for energy, cached_energy in zip(energies, cached):
+        assert (cached_energy == pytest.approx(energy))
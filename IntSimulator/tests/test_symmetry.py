@@ -0,0 +1,31 @@
+from IntSimulator.symmetry import SECTORS, sector_basis, projector, block_eigenpairs, sector_of
+from IntSimulator.sparse_hamiltonians import sparse_total_hamiltonian
+from IntSimulator.model import WireMaterial, InteractingModel
+import pytest
+import numpy as np
+
+def test_sectors_are_symmetries():
+    hamiltonian = sparse_total_hamiltonian(4, 1.1, 0.9)
+    assert (sum(sector_basis(4, *sector).shape[1] for sector in SECTORS) == 3 ** 4)
+
+    for sector in SECTORS:
+        P = projector(4, *sector)
+        assert (abs(P @ P - P).max() == pytest.approx(0))
+        assert (abs(P @ hamiltonian - hamiltonian @ P).max() == pytest.approx(0))
+
+def test_block_eigenpairs():
+    hamiltonian = sparse_total_hamiltonian(4, 1.1, 0.9)
+    energies, vectors, sectors = block_eigenpairs(hamiltonian, 4)
+
+    assert (energies == pytest.approx(np.linalg.eigvalsh(hamiltonian.toarray())))
+    assert (np.abs(hamiltonian @ vectors - vectors * energies).max() == pytest.approx(0))
+    for i in (0, 5, 40):
+        assert (sector_of(vectors[:, i], 4) == tuple(sectors[i]))
+
+def test_symmetry_solver_matches_full():
+    material = WireMaterial(12.4, (1, 1), 0.067, 'GaAs')
+    full, x = InteractingModel(material, 4, (0, 2)).print_result(10, True)
+    blocks, x = InteractingModel(material, 4, (0, 2)).print_result(10, True, solver='symmetry')
+
+    for energy, block_energy in zip(full, blocks):
+        assert (block_energy == pytest.approx(energy))
@@ -0,0 +1,89 @@
+from scipy.optimize import linear_sum_assignment
+import numpy as np
+
+
+'''
+    !!!Dependencies:
+        In this file, we use numpy and scipy.optimize.
+
+    Description:
+    This file follows eigenstates from one experiment to the next. The
+    overlaps between all tracked states and all new eigenstates are found
+    with a single matrix product, and every tracked state is then assigned
+    to a different new eigenstate so that the total overlap is largest.
+'''
+
+
+def overlap_matrix(previous, vectors):
+    """
+        This function gives the magnitude of the overlaps between the
+        tracked states and the new eigenstates.
+
+    Parameters
+    ----------
+    previous: numpy array
+        The tracked states as columns, or a single state.
+    vectors: numpy array
+        The new eigenstates as columns.
+
+    Returns
+    -------
+    overlaps: numpy array
+        overlaps[i, j] = |<previous_i|vectors_j>|.
+    """
+
+    previous = np.asarray(previous)
+    if previous.ndim == 1:
+        previous = previous[:, None]
+    return np.abs(previous.conj().T @ vectors)
+
+
+def assign_levels(overlaps):
+    """
+        This function assigns each tracked state to a different new
+        eigenstate, maximising the total overlap. A single tracked state
+        simply takes the eigenstate with the largest overlap.
+
+    Parameters
+    ----------
+    overlaps: numpy array
+        The overlap matrix, see overlap_matrix.
+
+    Returns
+    -------
+    indices: numpy array
+        indices[i] is the new eigenstate of the ith tracked state.
+    """
+
+    if overlaps.shape[0] == 1:
+        return np.array([np.argmax(overlaps[0])])
+    rows, cols = linear_sum_assignment(overlaps, maximize=True)
+    return cols[np.argsort(rows)]
+
+
+def track_states(previous, energies, vectors):
+    """
+        This function follows the tracked states to the new eigenstates.
+
+    Parameters
+    ----------
+    previous: numpy array
+        The tracked states as columns, or a single state.
+    energies: numpy array
+        The energies of the new eigenstates.
+    vectors: numpy array
+        The new eigenstates as columns. There must be at least as many
+        as tracked states.
+
+    Returns
+    -------
+    indices: numpy array
+        The chosen eigenstate of each tracked state.
+    energies: numpy array
+        The energies of the chosen eigenstates.
+    vectors: numpy array
+        The chosen eigenstates as columns.
+    """
+
+    indices = assign_levels(overlap_matrix(previous, vectors))
+    return indices, energies[indices], vectors[:, indices]